@@ -0,0 +1,51 @@
+def solve(env, algorithm, source, target, w_delay, w_rel, w_res, **params):
+    """
+    Единая точка запуска оптимизаторов.
+    algorithm: "GA", "QL", "ACO" или "PARETO". Дополнительные параметры передаются конструктору.
+    Ограничения QoS передаются параметром qos=QoSConstraints(...).
+    Всегда возвращает (path, cost); если путь не найден -> (None, inf).
+    """
+    if algorithm == "GA":
+        from algorithms.genetic import GeneticOptimizer
+        ga = GeneticOptimizer(env, source, target, w_delay, w_rel, w_res, **params)
+        path, cost = ga.run()
+    elif algorithm == "QL":
+        from algorithms.q_learning import QLearningOptimizer
+        ql = QLearningOptimizer(env, source, target, w_delay, w_rel, w_res, **params)
+        ql.train()
+        path, cost = ql.get_best_path()
+    elif algorithm == "ACO":
+        from algorithms.ant_colony import AntColonyOptimizer
+        aco = AntColonyOptimizer(env, source, target, w_delay, w_rel, w_res, **params)
+        path, cost = aco.run()
+    elif algorithm == "PARETO":
+        # Фронт строится один раз для (S, D), затем любые веса - argmin по фронту
+        from algorithms.pareto import default_store
+        front = default_store.get(env, source, target, params.get('epsilon', 0.05), params.get('qos'))
+        path, cost = front.best(w_delay, w_rel, w_res)
+    else:
+        raise ValueError(f"Неизвестный алгоритм: {algorithm}")
+
+    if not path:
+        return None, float('inf')
+    return path, cost
+
+
+def solve_concurrent(env, jobs, max_workers=8):
+    """
+    Параллельный запуск многих задач на одной загруженной сети.
+    jobs - список словарей с ключами algorithm, source, target, w_delay, w_rel, w_res
+    и необязательными параметрами оптимизатора (например, seed).
+    Оптимизаторы не изменяют env, а общие кэши среды защищены блокировкой,
+    поэтому при одинаковых seed результат совпадает с последовательным запуском.
+    Возвращает список (path, cost) в порядке jobs.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    def run(job):
+        params = dict(job)
+        return solve(env, params.pop('algorithm'), params.pop('source'), params.pop('target'),
+                     params.pop('w_delay'), params.pop('w_rel'), params.pop('w_res'), **params)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(run, jobs))
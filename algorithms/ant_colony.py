@@ -0,0 +1,169 @@
+import numpy as np
+
+
+class AntColonyOptimizer:
+    """
+    Муравьиный алгоритм (ACO) на массивах NetworkArrays.
+    Феромон - плоский массив по ребрам (порядок env.arrays). На каждой итерации
+    все муравьи строят пути одновременно: шаг колонии - это векторные операции
+    над строками соседей (CSR, дополненные до одинаковой длины), выбор следующего
+    узла - рулетка с весами tau^alpha * eta^beta, где eta = 1 / стоимость дуги.
+    Испарение и откладка феромона - тоже операции над всем массивом.
+    """
+
+    def __init__(self, env, source, target, w_delay, w_rel, w_res,
+                 num_ants=50, iterations=50, alpha=1.0, beta=2.0, rho=0.1, q=1.0,
+                 tau_min=1e-4, max_steps=None, qos=None, seed=None):
+        self.env = env
+        self.rng = np.random.default_rng(seed)
+        self.weights = (w_delay, w_rel, w_res)
+        self.qos = qos
+
+        self.num_ants = num_ants
+        self.iterations = iterations
+        self.alpha = alpha        # Вес феромона
+        self.beta = beta          # Вес эвристики (обратной стоимости)
+        self.rho = rho            # Скорость испарения
+        self.q = q                # Сколько феромона откладывает путь стоимостью 1
+        self.tau_min = tau_min    # Нижняя граница феромона: дуги не "умирают" совсем
+
+        a = env.arrays
+        self.arrays = a
+        # Узлы в solve() - это узлы env.graph; у массивов, построенных из графа,
+        # они могут отличаться от внутренних номеров 0..n-1
+        self.labels = a.node_labels if a.built_from_graph else None
+        self.source = a.node_index(source) if self.labels is not None else source
+        self.target = a.node_index(target) if self.labels is not None else target
+        self.max_steps = max_steps if max_steps is not None else a.num_nodes - 1
+
+        # Дуги, запрещенные ограничением пропускной способности, получают eta = 0
+        self.eta = 1.0 / np.maximum(a.arc_weighted_cost(*self.weights).astype(float), 1e-9)
+        if qos is not None and qos.min_bandwidth > 0:
+            self.eta[a.bandwidth[a.arc_edge] < qos.min_bandwidth] = 0.0
+        self.eta_beta = self.eta ** beta
+
+        self.pheromone = np.ones(a.num_edges)
+        self.padded = a.padded_arcs()   # (n, max_deg), -1 - пустые ячейки
+
+        self.history = []   # Лучшая стоимость по итерациям
+
+    def construct_paths(self, bound=float('inf')):
+        """
+        Одна итерация: все муравьи идут из S параллельно.
+        Муравей, чья частичная стоимость уже не меньше bound (лучшей найденной),
+        снимается: стоимости неотрицательны, и лучше он уже не станет.
+        Возвращает (nodes, edges, done, cost): nodes/edges - матрицы (шаги, муравьи)
+        с -1 после конца пути, done - дошел ли муравей до D, cost - взвешенная
+        стоимость пути (как calculate_weighted_cost).
+        """
+        a = self.arrays
+        n_ants = self.num_ants
+        w_delay, w_rel, w_res = self.weights
+        ants = np.arange(n_ants)
+
+        pos = np.full(n_ants, self.source)
+        visited = np.zeros((n_ants, a.num_nodes), dtype=bool)
+        visited[:, self.source] = True
+        active = np.ones(n_ants, dtype=bool)
+        done = np.zeros(n_ants, dtype=bool)
+        delay = np.zeros(n_ants)
+        rel_cost = np.zeros(n_ants)
+        res_cost = np.zeros(n_ants)
+
+        tau_alpha = self.pheromone ** self.alpha
+        node_steps = [pos.copy()]
+        edge_steps = []
+
+        for step in range(self.max_steps):
+            idx = ants[active]
+            if len(idx) == 0:
+                break
+            rows = self.padded[pos[idx]]                       # (k, max_deg) номера дуг
+            valid = rows >= 0
+            safe = np.where(valid, rows, 0)
+            nbrs = a.indices[safe]
+            valid &= ~visited[idx[:, None], nbrs]
+            weight = np.where(valid, tau_alpha[a.arc_edge[safe]] * self.eta_beta[safe], 0.0)
+
+            # Рулетка: первый столбец, где накопленный вес превысил случайный порог
+            cumulative = np.cumsum(weight, axis=1)
+            total = cumulative[:, -1]
+            stuck = total <= 0
+            r = self.rng.random(len(idx)) * total
+            choice = np.minimum((cumulative <= r[:, None]).sum(axis=1), rows.shape[1] - 1)
+            arc = safe[np.arange(len(idx)), choice]
+
+            # Тупик: все соседи посещены или запрещены
+            active[idx[stuck]] = False
+            idx, arc = idx[~stuck], arc[~stuck]
+
+            nxt = a.indices[arc]
+            edge = a.arc_edge[arc]
+            prev = pos[idx]
+            # Метрики узла учитываются при выходе из него (S и D не считаются)
+            inner = prev != self.source
+            delay[idx] += a.delay[edge] + np.where(inner, a.proc_delay[prev], 0.0)
+            rel_cost[idx] += a.rel_cost[edge] + np.where(inner, a.node_rel_cost[prev], 0.0)
+            res_cost[idx] += a.res_cost[edge]
+
+            pos[idx] = nxt
+            visited[idx, nxt] = True
+            step_nodes = np.full(n_ants, -1)
+            step_edges = np.full(n_ants, -1)
+            step_nodes[idx] = nxt
+            step_edges[idx] = edge
+            node_steps.append(step_nodes)
+            edge_steps.append(step_edges)
+
+            arrived = idx[nxt == self.target]
+            done[arrived] = True
+            active[arrived] = False
+
+            # Метрики уже пройденной части только растут - неперспективных снимаем сразу
+            partial = w_delay * delay[idx] + w_rel * rel_cost[idx] + w_res * res_cost[idx]
+            active[idx[partial >= bound]] = False
+            if self.qos is not None and self.qos.has_path_bounds():
+                over = (delay > self.qos.max_delay) | (rel_cost > self.qos.max_rel_cost)
+                active &= ~over
+                done &= ~over
+
+        nodes = np.array(node_steps)
+        edges = np.array(edge_steps) if edge_steps else np.empty((0, n_ants), dtype=np.int64)
+        cost = np.where(done, w_delay * delay + w_rel * rel_cost + w_res * res_cost, np.inf)
+        return nodes, edges, done, cost
+
+    def update_pheromone(self, edges, done, cost, best_edges, best_cost):
+        """Испарение на всех ребрах и откладка q / cost на ребрах дошедших муравьев и лучшего пути."""
+        self.pheromone *= (1.0 - self.rho)
+        if done.any():
+            mask = (edges >= 0) & done[None, :]
+            deposit = np.broadcast_to(self.q / np.where(done, cost, 1.0), edges.shape)
+            np.add.at(self.pheromone, edges[mask], deposit[mask])
+        if best_edges is not None:
+            # Элитный муравей: лучший найденный путь усиливается каждую итерацию
+            self.pheromone[best_edges] += self.q / best_cost
+        np.maximum(self.pheromone, self.tau_min, out=self.pheromone)
+
+    def run(self):
+        """Запуск колонии. Возвращает (path, cost); путь не найден -> (None, inf)."""
+        best_path, best_edges, best_cost = None, None, float('inf')
+        if self.source == self.target:
+            return None, float('inf')
+
+        for it in range(self.iterations):
+            nodes, edges, done, cost = self.construct_paths(best_cost)
+            if done.any():
+                ant = int(np.argmin(cost))
+                if cost[ant] < best_cost:
+                    best_cost = float(cost[ant])
+                    column = nodes[:, ant]
+                    best_path = column[column >= 0].tolist()
+                    best_edges = edges[:, ant][edges[:, ant] >= 0]
+            self.update_pheromone(edges, done, cost, best_edges, best_cost)
+            self.history.append(best_cost)
+
+        if best_path is None:
+            return None, float('inf')
+        if self.labels is not None:
+            best_path = [self.labels[i].item() for i in best_path]
+        return best_path, best_cost
@@ -0,0 +1,236 @@
+import numpy as np
+
+
+class BatchRouter:
+    """
+    Пакетная маршрутизация потоков с учетом пропускной способности.
+    Заявка: (S, D, required_bandwidth, (w_delay, w_rel, w_res)[, priority]).
+    Каждый принятый поток вычитает свою полосу из env.get_residual_bandwidth().
+
+    Поиск идет по массивам NetworkArrays: для пары (S, веса) дерево кратчайших путей
+    по полной сети строится один раз и кэшируется. Если путь из дерева помещается
+    в остаточную полосу, он оптимален и без фильтрации; иначе - Дейкстра только
+    по каналам с достаточным остатком. Если и так места нет, переразмещаются
+    только ранее принятые потоки, проходящие через насыщенные каналы.
+    """
+
+    def __init__(self, env, order="sequence", reroute=True, max_reroutes=8, weight_precision=0.01):
+        if order not in ("sequence", "priority"):
+            raise ValueError(f"Неизвестный порядок: {order}")
+        self.env = env
+        self.order = order
+        self.reroute = reroute
+        self.max_reroutes = max_reroutes
+        self.weight_precision = weight_precision
+
+        self._next_id = 0
+        self._attach()
+
+        # Статистика
+        self.accepted = 0
+        self.rejected = 0
+        self.rerouted = 0      # сколько ранее принятых потоков сменили путь
+        self.tree_hits = 0     # путь из кэшированного дерева поместился в остаток
+        self.searches = 0      # запусков Дейкстры (деревья + поиски с фильтром)
+
+    def _attach(self):
+        """Привязка к текущей версии сети: массивы, остатки полосы, пустые кэши."""
+        self.arrays = self.env.arrays
+        self.residual = self.env.get_residual_bandwidth()
+        self.version = self.env.version
+        self._arc_costs = {}   # квантованные веса -> стоимость дуг
+        self._trees = {}       # (S, квантованные веса) -> parent_arc
+        # D -> [(полоса, маска узлов)]: из этих узлов D недостижим с такой полосой.
+        # Остатки только уменьшаются, поэтому запись верна до первого release()
+        self._unreachable = {}
+        self._last_component = None   # Компонента source из последнего неудачного поиска
+        # Потоки: id -> (nodes, edges, bandwidth, weights); канал -> множество id потоков
+        self.flows = {}
+        self.edge_flows = {}
+
+    def _arc_cost(self, weights):
+        q = tuple(int(round(w / self.weight_precision)) for w in weights)
+        cost = self._arc_costs.get(q)
+        if cost is None:
+            cost = self.arrays.arc_weighted_cost(*weights)
+            self._arc_costs[q] = cost
+        return q, cost
+
+    def _preferred_path(self, source, target, weights):
+        """Лучший путь без учета занятой полосы (из кэшированного дерева)."""
+        q, cost = self._arc_cost(weights)
+        tree = self._trees.get((source, q))
+        if tree is None:
+            _, tree = self.arrays.shortest_path_tree(cost, source)
+            self._trees[(source, q)] = tree
+            self.searches += 1
+        return self.arrays.tree_path(tree, source, target)
+
+    def _residual_path(self, source, target, bandwidth, weights, remember=True):
+        """
+        Лучший путь только по каналам, где остаток >= bandwidth.
+        remember=False - во время переразмещения остатки временно не монотонны,
+        поэтому известные отказы не используются и не запоминаются.
+        """
+        if remember:
+            for known_bw, mask in self._unreachable.get(target, ()):
+                if known_bw <= bandwidth and mask[source]:
+                    self._last_component = mask
+                    return None, None
+        _, cost = self._arc_cost(weights)
+        usable = self.residual[self.arrays.arc_edge] >= bandwidth
+        dist, tree = self.arrays.shortest_path_tree(np.where(usable, cost, np.inf), source, target)
+        self.searches += 1
+        if not np.isfinite(dist[target]):
+            self._last_component = np.isfinite(dist)
+            if remember:
+                # Поиск обошел всю компоненту source - запоминаем ее для следующих заявок в target
+                self._unreachable.setdefault(target, []).append((bandwidth, self._last_component))
+            return None, None
+        return self.arrays.tree_path(tree, source, target)
+
+    def _reserve(self, flow_id, nodes, edges, bandwidth, weights):
+        np.subtract.at(self.residual, edges, bandwidth)
+        self.flows[flow_id] = (nodes, edges, bandwidth, weights)
+        for e in edges.tolist():
+            self.edge_flows.setdefault(e, set()).add(flow_id)
+
+    def _release(self, flow_id):
+        nodes, edges, bandwidth, weights = self.flows.pop(flow_id)
+        np.add.at(self.residual, edges, bandwidth)
+        for e in edges.tolist():
+            self.edge_flows[e].discard(flow_id)
+        return nodes, edges, bandwidth, weights
+
+    def release(self, flow_id):
+        """Снимает поток и возвращает его полосу каналам."""
+        self._unreachable.clear()   # Остатки выросли - прежние отказы больше не доказаны
+        return self._release(flow_id)
+
+    def _place(self, flow_id, source, target, bandwidth, weights):
+        """Размещает один поток. Возвращает True, если он принят."""
+        nodes, edges = self._preferred_path(source, target, weights)
+        if nodes is None:
+            return False
+        if len(edges) == 0 or self.residual[edges].min() >= bandwidth:
+            self.tree_hits += 1
+            self._reserve(flow_id, nodes, edges, bandwidth, weights)
+            return True
+
+        preferred = (nodes, edges)
+        nodes, edges = self._residual_path(source, target, bandwidth, weights)
+        if nodes is not None:
+            self._reserve(flow_id, nodes, edges, bandwidth, weights)
+            return True
+
+        if self.reroute:
+            return self._place_with_reroute(flow_id, bandwidth, weights, *preferred)
+        return False
+
+    def _place_with_reroute(self, flow_id, bandwidth, weights, nodes, edges):
+        """
+        Освобождает насыщенные каналы лучшего пути нового потока, переразмещая
+        проходящие через них ранее принятые потоки (сначала самые "толстые").
+        Если освободить не удается или кто-то из переразмещаемых не помещается -
+        все возвращается как было.
+        Все каналы на границе компоненты source (из неудачного поиска) уже полосы
+        заявки. Поток с концами по разные стороны границы обязан снова ее пересечь,
+        поэтому если ни один граничный канал его не вмещает - откат без поиска.
+        """
+        component = self._last_component
+        boundary = component[self.arrays.edge_u] != component[self.arrays.edge_v]
+        victims = []
+        for e in edges[self.residual[edges] < bandwidth].tolist():
+            on_edge = self.edge_flows.get(e, set())
+            freed = sum(self.flows[f][2] for f in victims if f in on_edge)
+            for f in sorted(on_edge - set(victims), key=lambda f: -self.flows[f][2]):
+                if self.residual[e] + freed >= bandwidth:
+                    break
+                victims.append(f)
+                freed += self.flows[f][2]
+            if self.residual[e] + freed < bandwidth or len(victims) > self.max_reroutes:
+                return False
+
+        saved = {f: self._release(f) for f in victims}
+        self._reserve(flow_id, nodes, edges, bandwidth, weights)
+        placed = [flow_id]
+        best_crossing = self.residual[boundary].max(initial=0.0)
+        ok = all(component[old_nodes[0]] == component[old_nodes[-1]] or bw <= best_crossing
+                 for old_nodes, _, bw, _ in saved.values())
+        if ok:
+            for f, (old_nodes, _, bw, w) in saved.items():
+                new_nodes, new_edges = self._residual_path(old_nodes[0], old_nodes[-1], bw, w, remember=False)
+                if new_nodes is None:
+                    ok = False
+                    break
+                self._reserve(f, new_nodes, new_edges, bw, w)
+                placed.append(f)
+
+        if not ok:
+            # Откат: снимаем все новые размещения и восстанавливаем старые пути
+            for f in placed:
+                self._release(f)
+            for f, (old_nodes, old_edges, bw, w) in saved.items():
+                self._reserve(f, old_nodes, old_edges, bw, w)
+            return False
+
+        self._unreachable.clear()
+        self.rerouted += len(victims)
+        return True
+
+    def flow_cost(self, flow_id):
+        """Взвешенная стоимость пути потока (как calculate_weighted_cost)."""
+        nodes, edges, _, (w_delay, w_rel, w_res) = self.flows[flow_id]
+        a = self.arrays
+        inner = np.asarray(nodes[1:-1], dtype=np.int64)
+        delay = a.delay[edges].sum() + a.proc_delay[inner].sum()
+        rel_cost = a.rel_cost[edges].sum() + a.node_rel_cost[inner].sum()
+        return float(w_delay * delay + w_rel * rel_cost + w_res * a.res_cost[edges].sum())
+
+    def route(self, demands):
+        """
+        Размещает пакет заявок по порядку (order="sequence") или по убыванию
+        приоритета (order="priority"). Потокам выдаются номера подряд
+        в порядке заявок. Возвращает [(path, cost)] в порядке заявок;
+        отклоненная заявка -> (None, inf). Пути переразмещенных ранее потоков
+        обновляются в self.flows.
+        """
+        if self.env.version != self.version:
+            self._attach()
+
+        labels = self.arrays.node_labels
+        ids = list(range(self._next_id, self._next_id + len(demands)))
+        self._next_id += len(demands)
+
+        sequence = range(len(demands))
+        if self.order == "priority":
+            sequence = sorted(sequence, key=lambda i: -(demands[i][4] if len(demands[i]) > 4 else 0))
+
+        results = [(None, float('inf'))] * len(demands)
+        for i in sequence:
+            source, target, bandwidth, weights = demands[i][:4]
+            if labels is not None:
+                source, target = self.arrays.node_index(source), self.arrays.node_index(target)
+            if source != target and self._place(ids[i], source, target, bandwidth, tuple(weights)):
+                self.accepted += 1
+            else:
+                self.rejected += 1
+
+        for i, flow_id in enumerate(ids):
+            if flow_id in self.flows:
+                nodes = self.flows[flow_id][0]
+                path = [labels[n].item() for n in nodes] if labels is not None else list(nodes)
+                results[i] = (path, self.flow_cost(flow_id))
+        return results
+
+    def stats(self):
+        total = self.accepted + self.rejected
+        return {
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "acceptance_ratio": self.accepted / total if total else 0.0,
+            "rerouted": self.rerouted,
+            "tree_hits": self.tree_hits,
+            "searches": self.searches,
+            "active_flows": len(self.flows),
+        }
@@ -0,0 +1,81 @@
+import threading
+from collections import OrderedDict
+
+import networkx as nx
+
+
+class CandidatePool:
+    """
+    Пул лучших путей (S, D) по взвешенной стоимости.
+    Пути перечисляются лениво алгоритмом Йена (nx.shortest_simple_paths):
+    следующий путь считается только когда он действительно нужен.
+    """
+
+    def __init__(self, graph, source, target, weight):
+        self.source = source
+        self.target = target
+        self.paths = []
+        # node -> список (номер пути, позиция узла в пути) для быстрого поиска хвостов
+        self.tails = {}
+        self._lock = threading.Lock()
+        try:
+            self._generator = nx.shortest_simple_paths(graph, source, target, weight=weight)
+        except nx.NodeNotFound:
+            self._generator = iter(())
+
+    def get(self, k):
+        """Первые k путей (меньше, если столько простых путей нет)."""
+        with self._lock:
+            while len(self.paths) < k and self._generator is not None:
+                try:
+                    path = next(self._generator)
+                except (StopIteration, nx.NetworkXNoPath):
+                    self._generator = None
+                    break
+                for pos, node in enumerate(path[:-1]):
+                    self.tails.setdefault(node, []).append((len(self.paths), pos))
+                self.paths.append(path)
+            return self.paths[:k]
+
+    def tail_from(self, node, rng, limit=None):
+        """
+        Случайный известный хороший хвост пула от node до D, или None.
+        limit - брать только первые limit путей пула: пул общий (default_pool_cache),
+        и без ограничения выбор зависел бы от того, сколько путей запросили другие запуски.
+        """
+        with self._lock:
+            entries = self.tails.get(node, ())
+            if limit is not None:
+                entries = [entry for entry in entries if entry[0] < limit]
+        if not entries:
+            return None
+        idx, pos = rng.choice(entries)
+        return self.paths[idx][pos:]
+
+
+class CandidatePoolCache:
+    """Кэш пулов с ключом (S, D, квантованные веса, QoS, версия сети) и LRU-вытеснением."""
+
+    def __init__(self, max_size=128, weight_precision=0.01):
+        self.max_size = max_size
+        self.weight_precision = weight_precision
+        self._pools = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, env, graph, source, target, weights, qos=None):
+        q = tuple(int(round(w / self.weight_precision)) for w in weights)
+        key = (source, target, q, qos.key() if qos else None, env.version)
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is not None:
+                self._pools.move_to_end(key)
+                return pool
+            pool = CandidatePool(graph, source, target, env.weighted_edge_cost(*weights, graph=graph))
+            self._pools[key] = pool
+            while len(self._pools) > self.max_size:
+                self._pools.popitem(last=False)
+            return pool
+
+
+# Общий кэш пулов для GeneticOptimizer
+default_pool_cache = CandidatePoolCache()
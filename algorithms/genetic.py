@@ -1,13 +1,28 @@
 import random
 import networkx as nx
 
+from landmarks import astar_path
+
 class GeneticOptimizer:
     def __init__(self, env, source, target, w_delay, w_rel, w_res, 
-                 pop_size=50, generations=100, mutation_rate=0.2):
+                 pop_size=50, generations=100, mutation_rate=0.2, qos=None,
+                 pool_size=0, pool_fraction=0.3, pool_tail_rate=0.5, use_landmarks=False,
+                 seed=None):
         self.env = env
-        self.graph = env.graph
+        # Собственный генератор: параллельные запуски не мешают друг другу,
+        # а при одинаковом seed результат воспроизводим
+        self.rng = random.Random(seed)
         self.source = source
         self.target = target
+
+        # Ограничения QoS: каналы ниже порога пропускной способности
+        # отсекаются заранее (кэшированный граф в env)
+        self.qos = qos
+        self.graph = env.get_bandwidth_view(qos.min_bandwidth) if qos else env.graph
+        self.delay_lb = None
+        self.rel_lb = None
+        if qos is not None and qos.has_path_bounds():
+            self.delay_lb, self.rel_lb = env.qos_lower_bounds(self.graph, target)
         
         # Веса для расчета стоимости (cite: 66)
         self.weights = (w_delay, w_rel, w_res)
@@ -18,23 +33,75 @@ class GeneticOptimizer:
         self.mutation_rate = mutation_rate
         
         self.population = []
+        # История лучшей стоимости: history[0] - стартовая популяция, затем по поколениям
+        self.history = []
+
+        # Пул k лучших путей (Йен): часть стартовой популяции и хвосты для мутации.
+        # pool_size=0 - без пула (чисто случайная инициализация)
+        self.pool = None
+        self.pool_size = pool_size
+        self.pool_limit = 0   # Сколько путей пула получил этот запуск (хвосты - только из них)
+        self.pool_fraction = pool_fraction
+        self.pool_tail_rate = pool_tail_rate
+        if pool_size > 0:
+            from algorithms.candidate_pool import default_pool_cache
+            self.pool = default_pool_cache.get(env, self.graph, source, target, self.weights, qos)
+
+        # Ориентиры (ALT): хвост мутации ищется A* по зашумленной взвешенной стоимости
+        self.heuristic = None
+        self.expanded = 0   # Сколько узлов раскрыли поиски хвостов
+        if use_landmarks:
+            self.heuristic = env.get_landmark_index().heuristic(target, *self.weights)
+            self.edge_cost = env.weighted_edge_cost(*self.weights, graph=self.graph)
 
     def get_fitness(self, path):
 
+        if self.qos is not None and self.qos.has_path_bounds():
+            d, r, res = self.env.calculate_path_metrics(path)
+            if not self.qos.is_satisfied(d, r):
+                return float('inf')  # Путь нарушает QoS
+            w_d, w_r, w_res = self.weights
+            return (w_d * d) + (w_r * r) + (w_res * res)
         return self.env.calculate_weighted_cost(path, *self.weights)
 
+    def is_feasible(self, path):
+        """Быстрая проверка пути на ограничения задержки и надежности."""
+        if self.qos is None or not self.qos.has_path_bounds():
+            return True
+        d, r, _ = self.env.calculate_path_metrics(path)
+        return self.qos.is_satisfied(d, r)
+
+    def prefix_can_finish(self, prefix):
+        """
+        Раннее отсечение: может ли путь с таким началом уложиться в QoS.
+        Метрики префикса + нижняя оценка остатка до D.
+        """
+        if self.delay_lb is None:
+            return True
+        last = prefix[-1]
+        if last not in self.delay_lb:
+            return False
+        d, r, _ = self.env.calculate_path_metrics(prefix) if len(prefix) > 1 else (0.0, 0.0, 0.0)
+        if len(prefix) > 1 and last != self.target:
+            # Последний узел префикса станет промежуточным
+            d += self.graph.nodes[last]['proc_delay']
+            r += self.graph.nodes[last]['rel_cost']
+        return (d + self.delay_lb[last] <= self.qos.max_delay and
+                r + self.rel_lb[last] <= self.qos.max_rel_cost)
+
+    def random_weight(self, u, v, data):
+        """Случайный вес дуги из собственного генератора оптимизатора."""
+        return self.rng.random()
+
     def create_random_path(self):
 
         try:
             # Используем генератор all_simple_paths с ограничением cutoff, 
             # чтобы не искать слишком долго, или делаем свой random walk.
             # Для скорости и разнообразия используем 'randomized shortest path' эвристику:
-            # Временно меняем веса ребер на случайные и ищем кратчайший путь.
-            
-            for u, v in self.graph.edges():
-                self.graph[u][v]['temp_weight'] = random.random()
-                
-            path = nx.shortest_path(self.graph, self.source, self.target, weight='temp_weight')
+            # Случайный вес выдается функцией веса при каждом обращении к дуге,
+            # поэтому общий граф среды не изменяется (безопасно для потоков).
+            path = nx.shortest_path(self.graph, self.source, self.target, weight=self.random_weight)
             return path
         except nx.NetworkXNoPath:
             return None
@@ -43,10 +110,28 @@ class GeneticOptimizer:
         """Создает стартовую популяцию путей."""
         print("GA: Инициализация популяции...")
         self.population = []
+        if self.pool is not None:
+            # Засеиваем часть популяции лучшими путями из пула
+            n_seed = min(self.pool_size, max(1, int(self.pop_size * self.pool_fraction)))
+            paths = self.pool.get(self.pool_size)
+            self.pool_limit = len(paths)
+            for path in paths[:n_seed]:
+                if path not in self.population and self.is_feasible(path):
+                    self.population.append(list(path))
+        if self.delay_lb is not None:
+            # При ограничениях QoS случайные пути часто недопустимы,
+            # поэтому добавляем пути, минимальные по задержке и по надежности
+            for metric in ('delay', 'rel_cost'):
+                try:
+                    path = nx.shortest_path(self.graph, self.source, self.target, weight=metric)
+                except nx.NetworkXNoPath:
+                    continue
+                if path not in self.population and self.is_feasible(path):
+                    self.population.append(path)
         attempts = 0
         while len(self.population) < self.pop_size and attempts < self.pop_size * 5:
             path = self.create_random_path()
-            if path and path not in self.population:
+            if path and path not in self.population and self.is_feasible(path):
                 self.population.append(path)
             attempts += 1
         
@@ -62,7 +147,7 @@ class GeneticOptimizer:
             return parent1, parent2  # Скрещивание невозможно, возвращаем как есть
 
         # Выбираем точку разрыва
-        pivot = random.choice(common_nodes)
+        pivot = self.rng.choice(common_nodes)
         
         # Индексы точки разрыва
         idx1 = parent1.index(pivot)
@@ -83,30 +168,50 @@ class GeneticOptimizer:
         Мутация (cite: 82).
         Выбираем узел и пытаемся перепроложить маршрут от него до D.
         """
-        if random.random() > self.mutation_rate:
+        if self.rng.random() > self.mutation_rate:
             return path
             
         if len(path) < 3: return path
 
         # Выбираем случайный узел разрыва (кроме последнего)
-        cut_idx = random.randint(1, len(path) - 2)
+        cut_idx = self.rng.randint(1, len(path) - 2)
         cut_node = path[cut_idx]
+
+        # Если уже начало пути не укладывается в QoS, новый хвост не поможет
+        if not self.prefix_can_finish(path[:cut_idx + 1]):
+            return path
         
+        # Если через cut_node проходит путь из пула - берем его известный хороший хвост
+        if self.pool is not None and self.rng.random() < self.pool_tail_rate:
+            tail = self.pool.tail_from(cut_node, self.rng, self.pool_limit)
+            if tail is not None:
+                new_path = path[:cut_idx] + tail
+                if len(new_path) == len(set(new_path)) and self.is_feasible(new_path):
+                    return new_path
+
+        if self.heuristic is not None:
+            # Шум только увеличивает стоимость дуг, поэтому оценка ориентиров остается допустимой
+            def noisy_cost(u, v, data):
+                return self.edge_cost(u, v, data) * (1.0 + self.rng.random())
+            new_tail, expanded = astar_path(self.graph, cut_node, self.target, noisy_cost, self.heuristic)
+            self.expanded += expanded
+            if new_tail is not None:
+                new_path = path[:cut_idx] + new_tail
+                if len(new_path) == len(set(new_path)) and self.is_feasible(new_path):
+                    return new_path
+            return path
+
         # Пытаемся найти новый кусок пути от cut_node до target
         # Опять используем трюк со случайными весами для разнообразия
         try:
-            # Временные веса для разнообразия
-            for u, v in self.graph.edges():
-                self.graph[u][v]['mut_weight'] = random.random()
-            
-            # Ищем путь от точки разрыва до конца
-            new_tail = nx.shortest_path(self.graph, cut_node, self.target, weight='mut_weight')
+            # Ищем путь от точки разрыва до конца (случайные веса, граф не меняется)
+            new_tail = nx.shortest_path(self.graph, cut_node, self.target, weight=self.random_weight)
             
             # Склеиваем: начало старого пути + новый хвост
             new_path = path[:cut_idx] + new_tail
             
-            # Проверка на циклы
-            if len(new_path) == len(set(new_path)):
+            # Проверка на циклы и ограничения QoS
+            if len(new_path) == len(set(new_path)) and self.is_feasible(new_path):
                 return new_path
         except:
             pass
@@ -120,6 +225,7 @@ class GeneticOptimizer:
         if not self.population:
             print("GA: Не удалось создать начальную популяцию.")
             return None, float('inf')
+        self.history.append(self.get_fitness(self.population[0]))
 
         for generation in range(self.generations):
             new_population = []
@@ -129,8 +235,9 @@ class GeneticOptimizer:
             
             while len(new_population) < self.pop_size:
                 # Селекция: Турнирный отбор (берем случайных и выбираем лучшего)
-                parent1 = min(random.sample(self.population, 5), key=self.get_fitness)
-                parent2 = min(random.sample(self.population, 5), key=self.get_fitness)
+                k = min(5, len(self.population))
+                parent1 = min(self.rng.sample(self.population, k), key=self.get_fitness)
+                parent2 = min(self.rng.sample(self.population, k), key=self.get_fitness)
                 
                 # Скрещивание
                 child1, child2 = self.crossover(parent1, parent2)
@@ -147,10 +254,14 @@ class GeneticOptimizer:
             self.population = new_population
             self.population.sort(key=self.get_fitness)
             
+            self.history.append(self.get_fitness(self.population[0]))
+
             # (Опционально) Вывод прогресса
             # best_cost = self.get_fitness(self.population[0])
             # print(f"Gen {generation}: Best Cost = {best_cost:.4f}")
 
         best_path = self.population[0]
         best_cost = self.get_fitness(best_path)
+        if best_cost == float('inf'):
+            return None, float('inf')  # Ни один путь не удовлетворяет QoS
         return best_path, best_cost
\ No newline at end of file
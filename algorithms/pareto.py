@@ -0,0 +1,187 @@
+import heapq
+import math
+import threading
+import numpy as np
+import networkx as nx
+
+
+class ParetoFront:
+    """
+    Множество недоминируемых путей для пары (S, D) по трем метрикам
+    (delay, rel_cost, res_cost) из calculate_path_metrics.
+    Любой вектор весов отвечается argmin по сохраненному фронту без нового поиска.
+    """
+
+    def __init__(self, source, target, paths, metrics, epsilon, version):
+        self.source = source
+        self.target = target
+        self.paths = paths
+        # Матрица (k, 3): delay, rel_cost, res_cost
+        self.metrics = np.asarray(metrics, dtype=float).reshape(-1, 3)
+        self.epsilon = epsilon
+        self.version = version
+
+    def __len__(self):
+        return len(self.paths)
+
+    def best(self, w_delay, w_rel, w_res):
+        """Лучший путь фронта для заданных весов -> (path, cost)."""
+        if not self.paths:
+            return None, float('inf')
+        costs = self.metrics @ np.array([w_delay, w_rel, w_res])
+        i = int(np.argmin(costs))
+        return list(self.paths[i]), float(costs[i])
+
+    def best_many(self, weights):
+        """
+        Векторный вариант best() для матрицы весов (m, 3).
+        Возвращает (индексы путей во фронте, стоимости).
+        """
+        costs = self.metrics @ np.asarray(weights, dtype=float).reshape(-1, 3).T
+        idx = np.argmin(costs, axis=0)
+        return idx, costs[idx, np.arange(costs.shape[1])]
+
+
+def _box(costs, log_base):
+    # Мультипликативные epsilon-ячейки: пути, отличающиеся меньше чем на (1+eps),
+    # попадают в одну ячейку и считаются эквивалентными
+    return tuple(math.floor(math.log(c) / log_base) if c > 0 else -10**9 for c in costs)
+
+
+def _box_dominates(a, b):
+    return a[0] <= b[0] and a[1] <= b[1] and a[2] <= b[2]
+
+
+def build_pareto_front(env, source, target, epsilon=0.05, qos=None):
+    """
+    Многокритериальный поиск с метками (label-correcting) с epsilon-доминированием.
+    Размер фронта ограничен числом epsilon-ячеек; метки, которые с учетом нижней
+    оценки остатка пути уже доминируются фронтом в D, отсекаются.
+    С qos ищем только по каналам с достаточной пропускной способностью,
+    а метки, нарушающие пределы задержки/надежности, отсекаются сразу.
+    """
+    graph = env.get_bandwidth_view(qos.min_bandwidth) if qos else env.graph
+    max_delay = qos.max_delay if qos else float('inf')
+    max_rel_cost = qos.max_rel_cost if qos else float('inf')
+    log_base = math.log1p(epsilon)
+
+    if source == target:
+        return ParetoFront(source, target, [], [], epsilon, env.version)
+
+    # Нижние оценки остатка пути до D по каждой метрике отдельно
+    lower = []
+    for metric in ('delay', 'rel_cost', 'res_cost'):
+        lower.append(nx.single_source_dijkstra_path_length(graph, target, weight=metric))
+    if source not in lower[0]:
+        return ParetoFront(source, target, [], [], epsilon, env.version)
+
+    # labels[i] = (costs, box, node, parent_id, alive)
+    labels = []
+    node_labels = {}   # узел -> список id живых меток
+    target_ids = []
+
+    def add_label(costs, node, parent):
+        box = _box(costs, log_base)
+        bucket = node_labels.setdefault(node, [])
+        for lid in bucket:
+            if labels[lid][4] and _box_dominates(labels[lid][1], box):
+                return None
+        # Новая метка вытесняет доминируемые ею
+        for lid in bucket:
+            if labels[lid][4] and _box_dominates(box, labels[lid][1]):
+                labels[lid][4] = False
+        bucket[:] = [lid for lid in bucket if labels[lid][4]]
+        labels.append([costs, box, node, parent, True])
+        bucket.append(len(labels) - 1)
+        return len(labels) - 1
+
+    def pruned_by_front(costs, node):
+        estimate = (costs[0] + lower[0][node], costs[1] + lower[1][node], costs[2] + lower[2][node])
+        if estimate[0] > max_delay or estimate[1] > max_rel_cost:
+            return True
+        box = _box(estimate, log_base)
+        for lid in target_ids:
+            if labels[lid][4] and _box_dominates(labels[lid][1], box):
+                return True
+        return False
+
+    start = add_label((0.0, 0.0, 0.0), source, -1)
+    heap = [(0.0, start)]
+
+    while heap:
+        _, lid = heapq.heappop(heap)
+        costs, _, u, _, alive = labels[lid]
+        if not alive:
+            continue
+        if u == target:
+            continue
+        if pruned_by_front(costs, u):
+            continue
+
+        node_u = graph.nodes[u]
+        for v, edge_data in graph[u].items():
+            if v not in lower[0]:
+                continue
+            d = costs[0] + edge_data['delay']
+            r = costs[1] + edge_data['rel_cost']
+            res = costs[2] + edge_data['res_cost']
+            # Узел u - промежуточный, если это не S
+            if u != source:
+                d += node_u['proc_delay']
+                r += node_u['rel_cost']
+            new_costs = (d, r, res)
+            if pruned_by_front(new_costs, v):
+                continue
+            new_id = add_label(new_costs, v, lid)
+            if new_id is None:
+                continue
+            if v == target:
+                target_ids.append(new_id)
+            else:
+                heapq.heappush(heap, (d, new_id))
+
+    paths = []
+    metrics = []
+    for lid in target_ids:
+        if not labels[lid][4]:
+            continue
+        path = []
+        cur = lid
+        while cur != -1:
+            path.append(labels[cur][2])
+            cur = labels[cur][3]
+        path.reverse()
+        # Проверка на циклы (при положительных метриках их быть не должно)
+        if len(path) != len(set(path)):
+            continue
+        paths.append(path)
+        metrics.append(labels[lid][0])
+
+    return ParetoFront(source, target, paths, metrics, epsilon, env.version)
+
+
+class ParetoFrontStore:
+    """Хранилище рассчитанных фронтов с ключом (S, D, epsilon, QoS, версия сети)."""
+
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self._fronts = {}
+        self._lock = threading.Lock()
+
+    def get(self, env, source, target, epsilon=0.05, qos=None):
+        key = (source, target, epsilon, qos.key() if qos else None, env.version)
+        with self._lock:
+            front = self._fronts.get(key)
+        if front is None:
+            # Строим вне блокировки: разные фронты считаются параллельно
+            front = build_pareto_front(env, source, target, epsilon, qos)
+            with self._lock:
+                if len(self._fronts) >= self.max_size and key not in self._fronts:
+                    # Удаляем самый старый фронт (словарь хранит порядок вставки)
+                    del self._fronts[next(iter(self._fronts))]
+                self._fronts[key] = front
+        return front
+
+
+# Общее хранилище для algorithms.solve("PARETO", ...)
+default_store = ParetoFrontStore()
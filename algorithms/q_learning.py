@@ -1,13 +1,27 @@
 import numpy as np
 import random
 
+# Награда за ветку, нарушающую ограничения QoS
+QOS_PENALTY = -1.0
+
 class QLearningOptimizer:
     def __init__(self, env, source, target, w_delay, w_rel, w_res, 
-                 episodes=1000, alpha=0.1, gamma=0.9, epsilon=0.1):
+                 episodes=1000, alpha=0.1, gamma=0.9, epsilon=0.1, qos=None,
+                 use_landmarks=False, seed=None):
         self.env = env
+        # Собственный генератор вместо глобального random (потокобезопасность, воспроизводимость)
+        self.rng = random.Random(seed)
         self.source = source
         self.target = target
         self.weights = (w_delay, w_rel, w_res)
+
+        # Ограничения QoS: граф без "узких" каналов + нижние оценки для отсечения
+        self.qos = qos
+        self.graph = env.get_bandwidth_view(qos.min_bandwidth) if qos else env.graph
+        self.delay_lb = None
+        self.rel_lb = None
+        if qos is not None and qos.has_path_bounds():
+            self.delay_lb, self.rel_lb = env.qos_lower_bounds(self.graph, target)
         
         # Гиперпараметры RL
         self.episodes = episodes  # Сколько раз агент попытается пройти путь
@@ -18,14 +32,67 @@ class QLearningOptimizer:
         # Q-Таблица: Словарь словарей. Q[state][next_node] = value
         # Инициализируем нулями
         self.q_table = {} 
-        for node in self.env.graph.nodes():
+        for node in self.graph.nodes():
             self.q_table[node] = {}
-            for neighbor in self.env.graph.neighbors(node):
+            for neighbor in self.graph.neighbors(node):
                 self.q_table[node][neighbor] = 0.0
 
+        if use_landmarks:
+            self.init_from_landmarks()
+
+    def init_from_landmarks(self):
+        """
+        Оптимистичная инициализация Q по индексу ориентиров (ALT):
+        Q(s, a) = 1000 / (оценка пути S->s + стоимость s->a + оценка a->D).
+        Все оценки - нижние границы стоимости, поэтому Q - верхняя граница награды,
+        и агент сначала пробует действия, ведущие в сторону цели.
+        """
+        index = self.env.get_landmark_index()
+        w = self.weights
+        to_target = index.heuristic(self.target, *w)
+        from_source = index.heuristic(self.source, *w)
+        edge_cost = self.env.weighted_edge_cost(*w, graph=self.graph)
+        nodes = self.graph.nodes
+        w_node_target = w[0] * nodes[self.target]['proc_delay'] + w[1] * nodes[self.target]['rel_cost']
+
+        for node in self.q_table:
+            come = from_source[node]
+            if node != self.source:
+                come += w[0] * nodes[node]['proc_delay'] + w[1] * nodes[node]['rel_cost']
+            for neighbor in self.q_table[node]:
+                cost = come + edge_cost(node, neighbor, self.graph[node][neighbor]) + to_target[neighbor]
+                if neighbor == self.target:
+                    cost -= w_node_target  # D не промежуточный узел
+                self.q_table[node][neighbor] = 1000.0 / max(cost, 0.0001)
+
     def get_valid_actions(self, state):
         """Возвращает список соседей текущего узла."""
-        return list(self.env.graph.neighbors(state))
+        return list(self.graph.neighbors(state))
+
+    def step_metrics(self, state, next_state):
+        """Прирост задержки и rel_cost при переходе state -> next_state."""
+        edge_data = self.graph[state][next_state]
+        d, r = edge_data['delay'], edge_data['rel_cost']
+        if state != self.source:
+            # state становится промежуточным узлом
+            d += self.graph.nodes[state]['proc_delay']
+            r += self.graph.nodes[state]['rel_cost']
+        return d, r
+
+    def violates_qos(self, acc_delay, acc_rel, node):
+        """
+        Раннее отсечение: даже лучший остаток пути из node не уложится в QoS.
+        acc_* - метрики пути до node (без собственной стоимости node).
+        """
+        if self.delay_lb is None:
+            return False
+        if node not in self.delay_lb:
+            return True
+        if node != self.target:
+            acc_delay += self.graph.nodes[node]['proc_delay']
+            acc_rel += self.graph.nodes[node]['rel_cost']
+        return (acc_delay + self.delay_lb[node] > self.qos.max_delay or
+                acc_rel + self.rel_lb[node] > self.qos.max_rel_cost)
 
     def choose_action(self, state):
         """Epsilon-Greedy стратегия: иногда исследуем, иногда используем знания."""
@@ -34,8 +101,8 @@ class QLearningOptimizer:
             return None
 
         # Случайное действие (Exploration)
-        if random.uniform(0, 1) < self.epsilon:
-            return random.choice(actions)
+        if self.rng.uniform(0, 1) < self.epsilon:
+            return self.rng.choice(actions)
         
         # Лучшее действие (Exploitation)
         # Ищем соседа с максимальным Q-значением
@@ -50,7 +117,7 @@ class QLearningOptimizer:
             elif q_val == max_q:
                 best_actions.append(action)
         
-        return random.choice(best_actions)
+        return self.rng.choice(best_actions)
 
     def train(self):
         """Основной цикл обучения."""
@@ -59,6 +126,7 @@ class QLearningOptimizer:
         for episode in range(self.episodes):
             state = self.source
             path = [state]
+            acc_delay, acc_rel = 0.0, 0.0
             
             # Ограничиваем длину пути, чтобы не зациклился навечно
             max_steps = self.env.num_nodes * 2 
@@ -69,6 +137,16 @@ class QLearningOptimizer:
                     break # Тупик
                 
                 next_state = action
+
+                if self.delay_lb is not None:
+                    step_d, step_r = self.step_metrics(state, next_state)
+                    acc_delay += step_d
+                    acc_rel += step_r
+                    if self.violates_qos(acc_delay, acc_rel, next_state):
+                        # Ветка не может уложиться в QoS: штраф и конец эпизода
+                        old_q = self.q_table[state][action]
+                        self.q_table[state][action] = old_q + self.alpha * (QOS_PENALTY - old_q)
+                        break
                 
                 # Если дошли до цели
                 if next_state == self.target:
@@ -121,11 +199,12 @@ class QLearningOptimizer:
         state = self.source
         
         visited = {state} # Чтобы не попасть в бесконечный цикл при выводе
+        acc_delay, acc_rel = 0.0, 0.0
         
         while state != self.target:
             actions = self.get_valid_actions(state)
             if not actions:
-                return None # Тупик
+                return None, float('inf') # Тупик
             
             # Выбираем соседа с максимальным Q
             best_action = None
@@ -133,21 +212,30 @@ class QLearningOptimizer:
             
             for action in actions:
                 if action not in visited: # Не ходим назад
+                    if self.delay_lb is not None:
+                        step_d, step_r = self.step_metrics(state, action)
+                        if self.violates_qos(acc_delay + step_d, acc_rel + step_r, action):
+                            continue
                     q_val = self.q_table[state].get(action, -float('inf'))
                     if q_val > max_q:
                         max_q = q_val
                         best_action = action
             
-            if best_action is None or max_q == 0:
+            if best_action is None or max_q <= 0:
                 # Если агент ничего не выучил для этого состояния, путь не найден
-                return None
+                return None, float('inf')
                 
+            if self.delay_lb is not None:
+                step_d, step_r = self.step_metrics(state, best_action)
+                acc_delay += step_d
+                acc_rel += step_r
+
             state = best_action
             path.append(state)
             visited.add(state)
             
             if len(path) > self.env.num_nodes: # Защита
-                return None
+                return None, float('inf')
                 
         # Считаем стоимость найденного пути
         cost = self.env.calculate_weighted_cost(path, *self.weights)
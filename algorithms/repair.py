@@ -0,0 +1,121 @@
+import networkx as nx
+
+from algorithms import solve
+
+
+def _is_link_failed(view, u, v):
+    return frozenset((u, v)) in view.failed_links
+
+
+def find_broken_segment(view, path):
+    """
+    Ищет поврежденный участок пути.
+    Возвращает (i, j): path[i] - ближайший уцелевший узел перед первым отказом,
+    path[j] - ближайший уцелевший узел после последнего отказа.
+    None - путь цел.
+    """
+    first = last = None
+    for k in range(len(path) - 1):
+        u, v = path[k], path[k + 1]
+        broken = _is_link_failed(view, u, v) or v in view.failed_nodes
+        if broken:
+            if first is None:
+                first = k
+            # Если отказал узел v, уцелевший узел после него - следующий
+            last = k + 2 if v in view.failed_nodes else k + 1
+    if first is None:
+        return None
+    return first, last
+
+
+def local_detour(view, path, i, j, weights, max_detour_hops=4):
+    """
+    Ограниченный локальный поиск обхода между path[i] и path[j].
+    Поиск идет только по узлам в пределах max_detour_hops прыжков от path[i]
+    и не использует узлы сохраняемых начала и конца пути (чтобы не было циклов).
+    """
+    upstream, downstream = path[i], path[j]
+    kept = set(path[:i]) | set(path[j + 1:])
+    graph = view.graph
+
+    # Шар радиуса max_detour_hops вокруг upstream (BFS по уцелевшему графу)
+    ball = {upstream}
+    frontier = [upstream]
+    for _ in range(max_detour_hops):
+        next_frontier = []
+        for node in frontier:
+            for neighbor in graph.neighbors(node):
+                if neighbor not in ball and neighbor not in kept:
+                    ball.add(neighbor)
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+        if downstream in ball:
+            break
+    if downstream not in ball:
+        return None
+
+    local_graph = nx.subgraph_view(graph, filter_node=ball.__contains__)
+    try:
+        detour = nx.dijkstra_path(local_graph, upstream, downstream,
+                                  weight=view.weighted_edge_cost(*weights, graph=local_graph))
+    except nx.NetworkXNoPath:
+        return None
+    return path[:i] + detour + path[j + 1:]
+
+
+def repair_path(env, path, w_delay, w_rel, w_res, failed_links=(), failed_nodes=(),
+                max_detour_hops=4, algorithm="GA", qos=None, view=None, **solver_params):
+    """
+    Ремонт маршрута после отказа каналов или узлов.
+    Сначала локальный обход поврежденного участка, полный пересчет (algorithms.solve)
+    - только если обход не найден или нарушает QoS.
+    Возвращает (path, cost, method), method: "intact", "local", "full".
+    path=None - маршрут восстановить нельзя.
+    """
+    if view is None:
+        view = env.failure_view(failed_links, failed_nodes)
+    weights = (w_delay, w_rel, w_res)
+    source, target = path[0], path[-1]
+
+    if source in view.failed_nodes or target in view.failed_nodes:
+        return None, float('inf'), "full"
+
+    segment = find_broken_segment(view, path)
+    if segment is None:
+        return list(path), view.calculate_weighted_cost(path, *weights), "intact"
+
+    new_path = local_detour(view, path, segment[0], segment[1], weights, max_detour_hops)
+    if new_path is not None and len(new_path) == len(set(new_path)) and view.satisfies_qos(new_path, qos):
+        return new_path, view.calculate_weighted_cost(new_path, *weights), "local"
+
+    # Запасной вариант - полный пересчет в сети без отказавших элементов
+    new_path, cost = solve(view, algorithm, source, target, *weights, qos=qos, **solver_params)
+    return new_path, cost, "full"
+
+
+def repair_cached_routes(cache, env, failed_links=(), failed_nodes=(), max_detour_hops=4, **solver_params):
+    """
+    Массовый ремонт: все маршруты кэша для текущей версии сети переносятся
+    в представление сети с отказами. Неповрежденные маршруты копируются как есть,
+    поврежденные - ремонтируются. Полный пересчет идет с параметрами оптимизатора
+    самой записи; solver_params дополняют их только там, где запись их не задавала.
+    Возвращает (view, stats): view - среда с отказами для последующих запросов.
+    """
+    from network_model import QoSConstraints
+
+    view = env.failure_view(failed_links, failed_nodes)
+    stats = {"intact": 0, "local": 0, "full": 0, "lost": 0}
+
+    for source, target, weights, algorithm, qos_key, params, path, cost in cache.items(env.version):
+        qos = QoSConstraints(*qos_key) if qos_key else None
+        if path is None:
+            # Отказ не может создать путь там, где его не было
+            cache.put(view, source, target, weights, algorithm, None, float('inf'), qos, params=params)
+            continue
+        new_path, new_cost, method = repair_path(
+            env, path, *weights, max_detour_hops=max_detour_hops,
+            algorithm=algorithm, qos=qos, view=view, **{**solver_params, **params})
+        stats[method if new_path else "lost"] += 1
+        cache.put(view, source, target, weights, algorithm, new_path, new_cost, qos, params=params)
+
+    return view, stats
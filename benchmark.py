@@ -1,40 +1,43 @@
 import time
 import random
 import numpy as np
-import matplotlib.pyplot as plt # Импортируем библиотеку для графиков
 
 # Импортируем наши модули
 from network_model import NetworkEnvironment
 from algorithms.genetic import GeneticOptimizer
 from algorithms.q_learning import QLearningOptimizer
+from algorithms.ant_colony import AntColonyOptimizer
+from algorithms.pareto import build_pareto_front
+from algorithms.repair import repair_path
 from utils import save_results_to_csv, generate_report_name
+from layout import compute_layout, KAMADA_KAWAI_MAX_NODES
 
 def plot_results(results):
+    # matplotlib нужен только для графиков - не загружаем его при импорте модуля
+    import matplotlib.pyplot as plt
 
     print("\nГенерация графиков...")
 
-    # Разделяем данные по алгоритмам
-    ga_times = [r['Time_ms'] for r in results if r['Algorithm'] == 'Genetic Algorithm']
-    ql_times = [r['Time_ms'] for r in results if r['Algorithm'] == 'Q-Learning']
+    # Алгоритмы в порядке появления в результатах
+    algorithms = []
+    for r in results:
+        if r['Algorithm'] not in algorithms:
+            algorithms.append(r['Algorithm'])
 
-    # Фильтруем стоимость (убираем "Not Found" и бесконечность)
-    ga_costs = [r['Cost'] for r in results if r['Algorithm'] == 'Genetic Algorithm' and isinstance(r['Cost'], (int, float)) and r['Cost'] != float('inf')]
-    ql_costs = [r['Cost'] for r in results if r['Algorithm'] == 'Q-Learning' and isinstance(r['Cost'], (int, float)) and r['Cost'] != float('inf')]
+    avg_times = []
+    avg_costs = []
+    for algo in algorithms:
+        times = [r['Time_ms'] for r in results if r['Algorithm'] == algo]
+        # Фильтруем стоимость (убираем "Not Found" и бесконечность)
+        costs = [r['Cost'] for r in results if r['Algorithm'] == algo and isinstance(r['Cost'], (int, float)) and r['Cost'] != float('inf')]
+        avg_times.append(np.mean(times) if times else 0)
+        avg_costs.append(np.mean(costs) if costs else 0)
 
-    # Считаем средние значения
-    avg_ga_time = np.mean(ga_times) if ga_times else 0
-    avg_ql_time = np.mean(ql_times) if ql_times else 0
-
-    avg_ga_cost = np.mean(ga_costs) if ga_costs else 0
-    avg_ql_cost = np.mean(ql_costs) if ql_costs else 0
-
-    algorithms = ['Genetic Algorithm', 'Q-Learning']
-    colors = ['#4CAF50', '#2196F3'] # Зеленый и Синий
+    colors = ['#4CAF50', '#2196F3', '#FF9800', '#9C27B0'][:len(algorithms)] # Зеленый, Синий, ...
 
     # --- График 1: Сравнение Времени ---
     plt.figure(figsize=(10, 6))
-    times = [avg_ga_time, avg_ql_time]
-    bars = plt.bar(algorithms, times, color=colors, alpha=0.7)
+    bars = plt.bar(algorithms, avg_times, color=colors, alpha=0.7)
     
     # Добавляем подписи значений над столбиками
     for bar in bars:
@@ -52,8 +55,7 @@ def plot_results(results):
 
     # --- График 2: Сравнение Стоимости (Качество) ---
     plt.figure(figsize=(10, 6))
-    costs = [avg_ga_cost, avg_ql_cost]
-    bars = plt.bar(algorithms, costs, color=colors, alpha=0.7)
+    bars = plt.bar(algorithms, avg_costs, color=colors, alpha=0.7)
     
     for bar in bars:
         height = bar.get_height()
@@ -68,10 +70,13 @@ def plot_results(results):
     plt.close()
     print("График стоимости сохранен как 'benchmark_cost.png'")
 
-def run_benchmark():
+def run_benchmark(seed=42):
     # 1. Создаем среду
     print("Инициализация сети для тестов...")
     env = NetworkEnvironment(num_nodes=250, connection_prob=0.4, seed=42)
+    # Свои генераторы: сценарии и веса одинаковы при каждом запуске
+    rng = random.Random(seed)
+    np_rng = np.random.default_rng(seed)
     
     # Параметры (чуть уменьшил для скорости демонстрации)
     NUM_TEST_CASES = 20  
@@ -82,6 +87,9 @@ def run_benchmark():
     W_RES = 0.34
     
     results = []
+    pareto_build_times = []
+    pareto_sizes = []
+    sweep_times = []
     
     print(f"Начинаем тестирование: {NUM_TEST_CASES} сценариев x {REPEATS} повторов.")
 
@@ -89,9 +97,9 @@ def run_benchmark():
     test_cases = []
     nodes = list(env.graph.nodes())
     for _ in range(NUM_TEST_CASES):
-        s = random.choice(nodes)
-        d = random.choice(nodes)
-        while s == d: d = random.choice(nodes)
+        s = rng.choice(nodes)
+        d = rng.choice(nodes)
+        while s == d: d = rng.choice(nodes)
         test_cases.append((s, d))
 
     # Цикл тестов
@@ -101,7 +109,8 @@ def run_benchmark():
         # GA
         for r in range(REPEATS):
             start = time.time()
-            ga = GeneticOptimizer(env, s, d, W_DELAY, W_REL, W_RES, pop_size=50, generations=50)
+            ga = GeneticOptimizer(env, s, d, W_DELAY, W_REL, W_RES, pop_size=50, generations=50,
+                                  seed=i * REPEATS + r)
             path, cost = ga.run()
             duration = (time.time() - start) * 1000
             
@@ -115,7 +124,7 @@ def run_benchmark():
         # Q-Learning
         for r in range(REPEATS):
             start = time.time()
-            ql = QLearningOptimizer(env, s, d, W_DELAY, W_REL, W_RES, episodes=500)
+            ql = QLearningOptimizer(env, s, d, W_DELAY, W_REL, W_RES, episodes=500, seed=i * REPEATS + r)
             ql.train()
             path, cost = ql.get_best_path()
             duration = (time.time() - start) * 1000
@@ -129,6 +138,50 @@ def run_benchmark():
                 "Path_Length": len(path) if path else 0
             })
 
+        # Муравьиный алгоритм (все муравьи итерации - одними векторными операциями)
+        for r in range(REPEATS):
+            start = time.time()
+            aco = AntColonyOptimizer(env, s, d, W_DELAY, W_REL, W_RES, num_ants=50, iterations=50,
+                                     seed=i * REPEATS + r)
+            path, cost = aco.run()
+            duration = (time.time() - start) * 1000
+
+            results.append({
+                "Test_ID": i+1, "Source": s, "Destination": d,
+                "Algorithm": "Ant Colony", "Run_ID": r+1,
+                "Time_ms": round(duration, 2), "Cost": round(cost, 4) if cost != float('inf') else float('inf'),
+                "Path_Length": len(path) if path else 0
+            })
+
+        # Pareto-фронт: строим один раз, затем отвечаем на веса без нового поиска
+        start = time.time()
+        front = build_pareto_front(env, s, d)
+        build_ms = (time.time() - start) * 1000
+        pareto_build_times.append(build_ms)
+        pareto_sizes.append(len(front))
+
+        for r in range(REPEATS):
+            start = time.perf_counter()
+            path, cost = front.best(W_DELAY, W_REL, W_RES)
+            duration = (time.perf_counter() - start) * 1000
+
+            results.append({
+                "Test_ID": i+1, "Source": s, "Destination": d,
+                "Algorithm": "Pareto Front", "Run_ID": r+1,
+                "Time_ms": round(duration, 4), "Cost": round(cost, 4) if cost != float('inf') else float('inf'),
+                "Path_Length": len(path) if path else 0
+            })
+
+        # Сразу много случайных векторов весов одним векторным argmin
+        random_weights = np_rng.dirichlet((1, 1, 1), size=1000)
+        start = time.perf_counter()
+        front.best_many(random_weights)
+        sweep_times.append((time.perf_counter() - start) * 1e6 / len(random_weights))
+
+    print(f"\nPareto: средний размер фронта {np.mean(pareto_sizes):.1f}, "
+          f"построение {np.mean(pareto_build_times):.1f} ms, "
+          f"ответ на вектор весов {np.mean(sweep_times):.3f} us")
+
     # Сохраняем CSV
     filename = generate_report_name()
     save_results_to_csv(results, filename)
@@ -137,5 +190,492 @@ def run_benchmark():
     # Рисуем графики
     plot_results(results)
 
+def run_layout_benchmark(node_counts=(250, 500, 1000, 2000, 5000, 10000), avg_degree=10):
+    """
+    Время построения раскладки при росте числа узлов.
+    Kamada-Kawai меряем только до KAMADA_KAWAI_MAX_NODES * 2 (дальше он слишком долгий).
+    """
+    results = []
+    for n in node_counts:
+        # Средняя степень постоянна, чтобы число ребер росло линейно
+        env = NetworkEnvironment(num_nodes=n, connection_prob=min(1.0, avg_degree / n), seed=42)
+        methods = ["sparse_force"]
+        if n <= KAMADA_KAWAI_MAX_NODES * 2:
+            methods.insert(0, "kamada_kawai")
+
+        for method in methods:
+            start = time.time()
+            _, used = compute_layout(env, method)
+            duration = (time.time() - start) * 1000
+            # Если Kamada-Kawai не сработал, в отчет идет запасной метод
+            print(f"Раскладка {used}: {n} узлов -> {duration:.1f} ms")
+            results.append({"Nodes": n, "Edges": env.graph.number_of_edges(),
+                            "Method": used, "Time_ms": round(duration, 2)})
+
+    save_results_to_csv(results, "layout_" + generate_report_name())
+    return results
+
+def run_repair_benchmark(num_cases=20, w=(0.33, 0.33, 0.34), seed=42):
+    """
+    Ремонт маршрута после отказа канала против полного пересчета GA:
+    задержка ремонта и разница в стоимости.
+    """
+    env = NetworkEnvironment(num_nodes=250, connection_prob=0.4, seed=42)
+    nodes = list(env.graph.nodes())
+    rng = random.Random(seed)
+    results = []
+
+    for i in range(num_cases):
+        s, d = rng.sample(nodes, 2)
+        ga = GeneticOptimizer(env, s, d, *w, pop_size=50, generations=50, seed=i)
+        path, cost = ga.run()
+        if not path:
+            continue
+        # Отказывает случайный канал на активном маршруте
+        k = rng.randrange(len(path) - 1)
+        failed = [(path[k], path[k + 1])]
+        view = env.failure_view(failed_links=failed)
+
+        start = time.time()
+        new_path, new_cost, method = repair_path(env, path, *w, view=view,
+                                                 pop_size=50, generations=50, seed=i)
+        repair_ms = (time.time() - start) * 1000
+
+        start = time.time()
+        ga = GeneticOptimizer(view, s, d, *w, pop_size=50, generations=50, seed=i)
+        full_path, full_cost = ga.run()
+        full_ms = (time.time() - start) * 1000
+
+        gap = (new_cost - full_cost) / full_cost * 100 if new_path and full_path else float('inf')
+        print(f"Отказ {i+1}/{num_cases}: ремонт ({method}) {repair_ms:.1f} ms, "
+              f"полный пересчет {full_ms:.1f} ms, разница стоимости {gap:+.2f}%")
+        results.append({"Test_ID": i+1, "Source": s, "Destination": d, "Method": method,
+                        "Repair_ms": round(repair_ms, 2), "Full_ms": round(full_ms, 2),
+                        "Repair_Cost": round(new_cost, 4), "Full_Cost": round(full_cost, 4),
+                        "Cost_Gap_pct": round(gap, 2)})
+
+    if results:
+        print(f"\nСредний ремонт: {np.mean([r['Repair_ms'] for r in results]):.1f} ms, "
+              f"полный пересчет: {np.mean([r['Full_ms'] for r in results]):.1f} ms, "
+              f"разница стоимости: {np.mean([r['Cost_Gap_pct'] for r in results]):+.2f}%")
+        save_results_to_csv(results, "repair_" + generate_report_name())
+    return results
+
+def generations_to_target(history, target_cost):
+    """
+    Номер первого поколения, в котором лучшая стоимость <= target_cost (None - не достигнута).
+    0 - цель достигнута уже стартовой популяцией (history[0]).
+    """
+    for generation, cost in enumerate(history):
+        if cost <= target_cost:
+            return generation
+    return None
+
+def run_pool_benchmark(num_cases=10, target_gap=0.01, w=(0.33, 0.33, 0.34), seed=42):
+    """
+    Сколько поколений нужно GA, чтобы подойти к оптимуму на target_gap,
+    без пула k кратчайших путей и с засеиванием из пула.
+    """
+    import networkx as nx
+
+    env = NetworkEnvironment(num_nodes=250, connection_prob=0.4, seed=42)
+    nodes = list(env.graph.nodes())
+    rng = random.Random(seed)
+    results = []
+
+    for i in range(num_cases):
+        s, d = rng.sample(nodes, 2)
+        optimum = nx.dijkstra_path(env.graph, s, d, weight=env.weighted_edge_cost(*w))
+        target_cost = env.calculate_weighted_cost(optimum, *w) * (1 + target_gap)
+
+        for label, pool_size in (("Random Init", 0), ("Pooled Seeding", 20)):
+            start = time.time()
+            ga = GeneticOptimizer(env, s, d, *w, pop_size=50, generations=50, pool_size=pool_size, seed=i)
+            path, cost = ga.run()
+            duration = (time.time() - start) * 1000
+            gens = generations_to_target(ga.history, target_cost)
+            print(f"Тест {i+1}/{num_cases} {label}: поколений до цели {gens}, "
+                  f"стоимость {cost:.4f} (цель {target_cost:.4f}), {duration:.0f} ms")
+            results.append({"Test_ID": i+1, "Source": s, "Destination": d, "Mode": label,
+                            "Generations_To_Target": gens if gens is not None else "Not Reached",
+                            "Cost": round(cost, 4), "Target_Cost": round(target_cost, 4),
+                            "Time_ms": round(duration, 2)})
+
+    for label in ("Random Init", "Pooled Seeding"):
+        gens = [r['Generations_To_Target'] for r in results if r['Mode'] == label]
+        reached = [g for g in gens if g != "Not Reached"]
+        avg = np.mean(reached) if reached else float('nan')
+        print(f"{label}: цель достигнута в {len(reached)}/{len(gens)}, в среднем за {avg:.1f} поколений")
+    save_results_to_csv(results, "pool_" + generate_report_name())
+    return results
+
+def run_landmark_benchmark(num_cases=20, w=(0.33, 0.33, 0.34), seed=42):
+    """
+    Индекс ориентиров (ALT): раскрытые узлы и время A* против Дейкстры,
+    влияние на GA и Q-Learning, стоимость инкрементального обновления индекса.
+    """
+    from landmarks import astar_path
+
+    env = NetworkEnvironment(num_nodes=250, connection_prob=0.4, seed=42)
+    nodes = list(env.graph.nodes())
+    rng = random.Random(seed)
+
+    start = time.time()
+    index = env.get_landmark_index()
+    print(f"Построение индекса ({len(index.landmarks)} ориентиров): {(time.time() - start) * 1000:.1f} ms")
+
+    results = []
+    edge_cost = env.weighted_edge_cost(*w)
+    for i in range(num_cases):
+        s, d = rng.sample(nodes, 2)
+        heuristic = index.heuristic(d, *w)
+        for label, h in (("Dijkstra", None), ("ALT A*", heuristic)):
+            start = time.perf_counter()
+            path, expanded = astar_path(env.graph, s, d, edge_cost, h)
+            duration = (time.perf_counter() - start) * 1000
+            results.append({"Test_ID": i+1, "Source": s, "Destination": d, "Algorithm": label,
+                            "Time_ms": round(duration, 3), "Expanded": expanded,
+                            "Cost": round(env.calculate_weighted_cost(path, *w), 4)})
+
+        for label, use in (("GA", False), ("GA + ALT", True)):
+            start = time.time()
+            ga = GeneticOptimizer(env, s, d, *w, pop_size=30, generations=30, use_landmarks=use, seed=i)
+            path, cost = ga.run()
+            results.append({"Test_ID": i+1, "Source": s, "Destination": d, "Algorithm": label,
+                            "Time_ms": round((time.time() - start) * 1000, 2),
+                            "Expanded": ga.expanded if use else "", "Cost": round(cost, 4)})
+
+        for label, use in (("Q-Learning", False), ("Q-Learning + ALT", True)):
+            start = time.time()
+            ql = QLearningOptimizer(env, s, d, *w, episodes=500, use_landmarks=use, seed=i)
+            ql.train()
+            path, cost = ql.get_best_path()
+            results.append({"Test_ID": i+1, "Source": s, "Destination": d, "Algorithm": label,
+                            "Time_ms": round((time.time() - start) * 1000, 2), "Expanded": "",
+                            "Cost": round(cost, 4) if path else float('inf')})
+
+    print()
+    for label in ("Dijkstra", "ALT A*", "GA", "GA + ALT", "Q-Learning", "Q-Learning + ALT"):
+        rows = [r for r in results if r['Algorithm'] == label]
+        costs = [r['Cost'] for r in rows if r['Cost'] != float('inf')]
+        expanded = [r['Expanded'] for r in rows if r['Expanded'] != ""]
+        line = f"{label}: {np.mean([r['Time_ms'] for r in rows]):.2f} ms, стоимость {np.mean(costs) if costs else float('inf'):.4f}"
+        if expanded:
+            line += f", раскрыто узлов {np.mean(expanded):.1f}"
+        print(line + f", найдено {len(costs)}/{len(rows)}")
+
+    # Инкрементальное обновление: меняем метрики одного канала
+    u, v = next(iter(env.graph.edges()))
+    env.update_link(u, v, delay=env.graph[u][v]['delay'] * 2)
+    start = time.time()
+    env.get_landmark_index()
+    print(f"Обновление индекса после изменения канала: {(time.time() - start) * 1000:.1f} ms, "
+          f"пересчитано {index.rebuilt} из {len(index.landmarks) * 3} деревьев")
+
+    save_results_to_csv(results, "landmarks_" + generate_report_name())
+    return results
+
+def run_thread_stress_test(num_jobs=64, workers=(1, 4, 16, 32), w=(0.33, 0.33, 0.34)):
+    """
+    Стресс-тест параллельных запусков на одной сети: задачи GA, QL и ACO с фиксированными seed
+    выполняются в пуле потоков, результаты должны совпадать с последовательным запуском.
+    """
+    from algorithms import solve, solve_concurrent
+
+    env = NetworkEnvironment(num_nodes=250, connection_prob=0.4, seed=42)
+    nodes = list(env.graph.nodes())
+    rng = random.Random(42)
+
+    jobs = []
+    for i in range(num_jobs):
+        s, d = rng.sample(nodes, 2)
+        if i % 3 == 0:
+            jobs.append({"algorithm": "GA", "source": s, "target": d, "w_delay": w[0], "w_rel": w[1],
+                         "w_res": w[2], "pop_size": 30, "generations": 30, "seed": i})
+        elif i % 3 == 1:
+            jobs.append({"algorithm": "ACO", "source": s, "target": d, "w_delay": w[0], "w_rel": w[1],
+                         "w_res": w[2], "num_ants": 30, "iterations": 30, "seed": i})
+        else:
+            jobs.append({"algorithm": "QL", "source": s, "target": d, "w_delay": w[0], "w_rel": w[1],
+                         "w_res": w[2], "episodes": 300, "seed": i})
+
+    start = time.time()
+    serial = [solve(env, **job) for job in jobs]
+    serial_time = time.time() - start
+    print(f"Последовательно: {serial_time:.2f} s")
+
+    results = []
+    for n in workers:
+        start = time.time()
+        parallel = solve_concurrent(env, jobs, max_workers=n)
+        duration = time.time() - start
+        mismatches = sum(1 for a, b in zip(serial, parallel) if a != b)
+        print(f"{n} потоков: {duration:.2f} s, расхождений с последовательным запуском: {mismatches}")
+        results.append({"Workers": n, "Jobs": num_jobs, "Time_s": round(duration, 3),
+                        "Serial_Time_s": round(serial_time, 3), "Mismatches": mismatches})
+        assert mismatches == 0, "Параллельный запуск дал другой результат"
+
+    save_results_to_csv(results, "threads_" + generate_report_name())
+    return results
+
+def run_batch_benchmark(num_demands=10000, hot_share=0.5, num_hot=5, bandwidth_range=(20, 200)):
+    """
+    Пакетная маршрутизация потоков с учетом полосы: заявок в секунду и доля принятых
+    для порядка "по очереди" / "по приоритету", с переразмещением и без.
+    Половина заявок идет в несколько "горячих" узлов, чтобы каналы насыщались.
+    """
+    from algorithms.batch_router import BatchRouter
+
+    env = NetworkEnvironment(num_nodes=250, connection_prob=0.4, seed=42)
+    nodes = list(env.graph.nodes())
+    rng = random.Random(42)
+    profiles = [(0.33, 0.33, 0.34), (0.7, 0.2, 0.1), (0.1, 0.2, 0.7), (0.2, 0.7, 0.1)]
+    hot = rng.sample(nodes, num_hot)
+
+    demands = []
+    for _ in range(num_demands):
+        s = rng.choice(nodes)
+        d = rng.choice(hot) if rng.random() < hot_share else rng.choice(nodes)
+        while d == s:
+            d = rng.choice(nodes)
+        demands.append((s, d, rng.uniform(*bandwidth_range), rng.choice(profiles), rng.randint(0, 3)))
+
+    results = []
+    for order in ("sequence", "priority"):
+        for reroute in (False, True):
+            env.reset_residual_bandwidth()
+            router = BatchRouter(env, order=order, reroute=reroute)
+            start = time.time()
+            router.route(demands)
+            duration = time.time() - start
+            stats = router.stats()
+            print(f"{order}, переразмещение={'да' if reroute else 'нет'}: "
+                  f"{num_demands / duration:.0f} заявок/с ({duration:.2f} s), "
+                  f"принято {stats['acceptance_ratio']:.1%}, переразмещено {stats['rerouted']}, "
+                  f"путь из дерева {stats['tree_hits']}, поисков {stats['searches']}")
+            results.append({"Order": order, "Reroute": reroute, "Demands": num_demands,
+                            "Time_s": round(duration, 3), "Demands_per_s": round(num_demands / duration, 1),
+                            "Acceptance": round(stats['acceptance_ratio'], 4), "Rerouted": stats['rerouted'],
+                            "Tree_Hits": stats['tree_hits'], "Searches": stats['searches']})
+
+    save_results_to_csv(results, "batch_" + generate_report_name())
+    return results
+
+def _random_arrays(num_nodes, avg_degree=10, seed=42, compact=False):
+    """
+    Случайная разреженная сеть сразу в виде NetworkArrays (метрики как в Разделе 2.1).
+    compact=True - сразу float32/int32, без промежуточной копии float64.
+    """
+    from network_arrays import NetworkArrays
+
+    rng = np.random.default_rng(seed)
+    m = num_nodes * avg_degree // 2
+    u = rng.integers(0, num_nodes, m)
+    v = rng.integers(0, num_nodes, m)
+    keep = u != v
+    key = np.unique(np.minimum(u, v)[keep] * num_nodes + np.maximum(u, v)[keep])
+    del u, v, keep
+    m = len(key)
+    index_dtype, float_dtype = (np.int32, np.float32) if compact else (np.int64, float)
+
+    def uniform(low, high, size):
+        return rng.uniform(low, high, size).astype(float_dtype, copy=False)
+
+    return NetworkArrays(num_nodes, (key // num_nodes).astype(index_dtype, copy=False),
+                         (key % num_nodes).astype(index_dtype, copy=False),
+                         uniform(100, 1000, m), uniform(3, 15, m), uniform(0.95, 0.999, m),
+                         uniform(0.5, 2.0, num_nodes), uniform(0.95, 0.999, num_nodes))
+
+def _memory_probe(config):
+    """
+    Выполняется в отдельном процессе (см. run_memory_benchmark): строит одну конфигурацию,
+    печатает memory_report() и пиковый RSS процесса.
+    """
+    import json
+    from memory import memory_report
+
+    env, optimizers = None, []
+    if config["kind"] == "graph":
+        env = NetworkEnvironment(num_nodes=config["nodes"], connection_prob=config["prob"], seed=42)
+        if config.get("optimizers"):
+            ga = GeneticOptimizer(env, 0, 1, 0.33, 0.33, 0.34, pop_size=50, generations=20, seed=1)
+            ga.run()
+            ql = QLearningOptimizer(env, 0, 1, 0.33, 0.33, 0.34, episodes=200, seed=1)
+            ql.train()
+            optimizers = [ga, ql]
+    elif config["kind"] in ("arrays", "networkx"):
+        from algorithms.batch_router import BatchRouter
+
+        arrays = _random_arrays(config["nodes"], config["degree"], compact=config.get("compact", False))
+        env = NetworkEnvironment.from_arrays(arrays)
+        if config["kind"] == "networkx":
+            env.graph  # Строим граф networkx из массивов
+        else:
+            rng = random.Random(1)
+            demands = [(rng.randrange(config["nodes"]), rng.randrange(config["nodes"]), 10.0,
+                        (0.33, 0.33, 0.34)) for _ in range(5)]
+            BatchRouter(env).route(demands)
+    elif config["kind"] == "loader":
+        from topology_loader import load_topology
+
+        env = load_topology(config["path"], config.get("nodes_path"), compact=config.get("compact", False))
+
+    report = memory_report(env, optimizers) if env is not None else {}
+    print("MEMORY_PROBE " + json.dumps({"report": report, "peak_rss_kb": _rss_kb("VmHWM"),
+                                         "rss_kb": _rss_kb("VmRSS")}))
+
+def _rss_kb(field="VmHWM"):
+    """
+    RSS процесса в KB: VmHWM - пиковый, VmRSS - текущий. На Linux читаем /proc:
+    ru_maxrss наследует пик родительского процесса через fork/exec и искажает замер.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def run_memory_benchmark(configs=None, rtol=1e-5):
+    """
+    Пиковый RSS и разбивка memory_report() для каждой конфигурации - каждая
+    в отдельном процессе, чтобы пики не смешивались. Для компактного режима
+    дополнительно проверяется точность против float64.
+    """
+    import json
+    import os
+    import shutil
+    import subprocess
+    import sys
+    import tempfile
+    from topology_loader import save_edge_list
+
+    # Файл топологии для замера пути загрузки (load_topology), как у реальных данных
+    tmp_dir = tempfile.mkdtemp(prefix="memory_bench_")
+    edges_path = os.path.join(tmp_dir, "edges_200k.csv")
+    nodes_path = os.path.join(tmp_dir, "nodes_200k.csv")
+    save_edge_list(_random_arrays(200_000, 10), edges_path, nodes_path)
+
+    if configs is None:
+        configs = [
+            {"name": "baseline (импорты)", "kind": "none"},
+            {"name": "networkx 250, GA + QL", "kind": "graph", "nodes": 250, "prob": 0.4, "optimizers": True},
+            {"name": "networkx 50k", "kind": "networkx", "nodes": 50_000, "degree": 10},
+            {"name": "arrays 50k float64", "kind": "arrays", "nodes": 50_000, "degree": 10},
+            {"name": "arrays 50k compact", "kind": "arrays", "nodes": 50_000, "degree": 10, "compact": True},
+            {"name": "arrays 200k float64", "kind": "arrays", "nodes": 200_000, "degree": 10},
+            {"name": "arrays 200k compact", "kind": "arrays", "nodes": 200_000, "degree": 10, "compact": True},
+            {"name": "load_topology 200k float64", "kind": "loader", "path": edges_path, "nodes_path": nodes_path},
+            {"name": "load_topology 200k compact", "kind": "loader", "path": edges_path, "nodes_path": nodes_path,
+             "compact": True},
+        ]
+
+    # Точность компактного режима: стоимости и метрики путей против float64
+    reference = _random_arrays(50_000, 10)
+    precision = reference.compare_precision(reference.to_compact(), num_sources=5)
+    print(f"Компактный режим: макс. отн. ошибка стоимости {precision['max_cost_rel_err']:.2e}, "
+          f"метрик {precision['max_metric_rel_err']:.2e}, совпало деревьев {precision['same_tree_ratio']:.2%}")
+    assert precision['max_cost_rel_err'] <= rtol and precision['max_metric_rel_err'] <= rtol, \
+        "Компактный режим превышает допуск точности"
+
+    root = os.path.dirname(os.path.abspath(__file__))
+    results = []
+    try:
+        for config in configs:
+            code = "import sys, json, benchmark; benchmark._memory_probe(json.loads(sys.argv[1]))"
+            proc = subprocess.run([sys.executable, "-c", code, json.dumps(config)],
+                                  capture_output=True, text=True, cwd=root)
+            line = next((l for l in proc.stdout.splitlines() if l.startswith("MEMORY_PROBE ")), None)
+            if line is None:
+                raise RuntimeError(proc.stderr[-2000:])
+            probe = json.loads(line[len("MEMORY_PROBE "):])
+            report = probe["report"]
+            row = {"Config": config["name"], "Peak_RSS_MB": round(probe["peak_rss_kb"] / 1024, 1),
+                   "RSS_MB": round(probe["rss_kb"] / 1024, 1)}
+            for key in ("topology", "metrics", "q_tables", "populations", "caches", "total"):
+                row[key.capitalize() + "_MB"] = round(report.get(key, 0) / 2**20, 2)
+            results.append(row)
+            print(f"{config['name']}: пик RSS {row['Peak_RSS_MB']} MB, RSS {row['RSS_MB']} MB, учтено {row['Total_MB']} MB "
+                  f"(топология {row['Topology_MB']}, метрики {row['Metrics_MB']}, Q {row['Q_tables_MB']}, "
+                  f"кэши {row['Caches_MB']})")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    save_results_to_csv(results, "memory_" + generate_report_name())
+    return results
+
+def run_startup_benchmark(repeats=5, import_budget_ms=400.0,
+                          forbidden=("matplotlib", "tkinter", "scipy")):
+    """
+    Холодный старт одиночного запроса маршрута: python -X importtime main.py route ...
+    Суммарное время импортов сравнивается с бюджетом, графические модули
+    не должны загружаться вовсе.
+    """
+    import os
+    import subprocess
+    import sys
+
+    root = os.path.dirname(os.path.abspath(__file__))
+    cmd = [sys.executable, "-X", "importtime", os.path.join(root, "main.py"), "route",
+           "--nodes", "50", "--prob", "0.2", "--source", "0", "--target", "10",
+           "--algorithm", "PARETO", "--json"]
+
+    results = []
+    for r in range(repeats):
+        start = time.time()
+        proc = subprocess.run(cmd, capture_output=True, text=True, cwd=root)
+        wall_ms = (time.time() - start) * 1000
+        if proc.returncode != 0:
+            raise RuntimeError(proc.stderr[-2000:])
+
+        # Строки вида "import time: self [us] | cumulative | имя"; верхний уровень - один пробел перед именем
+        top_level = {}
+        loaded = set()
+        for line in proc.stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative, name = line.split("|")
+            loaded.add(name.strip().split(".")[0])
+            if not name.startswith("  "):
+                top_level[name.strip()] = int(cumulative) / 1000
+        import_ms = sum(top_level.values())
+        heaviest = sorted(top_level.items(), key=lambda x: -x[1])[:3]
+        results.append({"Run_ID": r+1, "Wall_ms": round(wall_ms, 1), "Import_ms": round(import_ms, 1),
+                        "Modules": len(loaded),
+                        "Heaviest": ", ".join(f"{n} {t:.0f}ms" for n, t in heaviest),
+                        "Forbidden": ", ".join(m for m in forbidden if m in loaded)})
+
+    import_ms = float(np.median([r['Import_ms'] for r in results]))
+    print(f"Запрос маршрута: {np.median([r['Wall_ms'] for r in results]):.0f} ms всего, "
+          f"импорты {import_ms:.0f} ms (бюджет {import_budget_ms:.0f} ms)")
+    print(f"Самые тяжелые импорты: {results[-1]['Heaviest']}")
+    save_results_to_csv(results, "startup_" + generate_report_name())
+
+    loaded_forbidden = {r['Forbidden'] for r in results if r['Forbidden']}
+    assert not loaded_forbidden, f"Запрос маршрута загрузил лишние модули: {loaded_forbidden}"
+    assert import_ms <= import_budget_ms, f"Импорты {import_ms:.0f} ms превышают бюджет {import_budget_ms:.0f} ms"
+    return results
+
 if __name__ == "__main__":
-    run_benchmark()
\ No newline at end of file
+    import sys
+    if len(sys.argv) > 1 and sys.argv[1] == "layout":
+        run_layout_benchmark()
+    elif len(sys.argv) > 1 and sys.argv[1] == "repair":
+        run_repair_benchmark()
+    elif len(sys.argv) > 1 and sys.argv[1] == "pool":
+        run_pool_benchmark()
+    elif len(sys.argv) > 1 and sys.argv[1] == "landmarks":
+        run_landmark_benchmark()
+    elif len(sys.argv) > 1 and sys.argv[1] == "threads":
+        run_thread_stress_test()
+    elif len(sys.argv) > 1 and sys.argv[1] == "batch":
+        run_batch_benchmark()
+    elif len(sys.argv) > 1 and sys.argv[1] == "memory":
+        run_memory_benchmark()
+    elif len(sys.argv) > 1 and sys.argv[1] == "startup":
+        run_startup_benchmark()
+    else:
+        run_benchmark()
\ No newline at end of file
@@ -0,0 +1,152 @@
+import heapq
+import numpy as np
+import networkx as nx
+
+METRICS = ('delay', 'rel_cost', 'res_cost')
+
+
+def astar_path(graph, source, target, weight, heuristic=None):
+    """
+    A* по графу networkx с подсчетом раскрытых узлов.
+    weight(u, v, data) - стоимость дуги, heuristic[node] - нижняя оценка остатка до target
+    (None - обычный Дейкстра). Возвращает (path, expanded); path=None - пути нет.
+    """
+    h = heuristic.__getitem__ if heuristic is not None else (lambda node: 0.0)
+    dist = {source: 0.0}
+    parent = {source: None}
+    closed = set()
+    heap = [(h(source), 0.0, source)]
+    expanded = 0
+
+    while heap:
+        _, g, u = heapq.heappop(heap)
+        if u in closed:
+            continue
+        closed.add(u)
+        expanded += 1
+        if u == target:
+            path = [u]
+            while parent[path[-1]] is not None:
+                path.append(parent[path[-1]])
+            path.reverse()
+            return path, expanded
+        for v, data in graph[u].items():
+            if v in closed:
+                continue
+            new_g = g + weight(u, v, data)
+            if new_g < dist.get(v, float('inf')):
+                dist[v] = new_g
+                parent[v] = u
+                heapq.heappush(heap, (new_g + h(v), new_g, v))
+
+    return None, expanded
+
+
+class LandmarkIndex:
+    """
+    Индекс ориентиров (ALT) для NetworkEnvironment.
+    Для нескольких узлов-ориентиров хранятся кратчайшие расстояния до всех узлов
+    по каждой метрике канала отдельно: массив float (L, 3, n).
+    По неравенству треугольника |d(L, t) - d(L, v)| - допустимая нижняя оценка
+    остатка пути v -> t по метрике, а для любых весов w оценка взвешенной
+    стоимости - сумма w_i * max_L |...|. Стоимости узлов не учитываются
+    (они неотрицательны), поэтому оценка остается допустимой.
+    """
+
+    def __init__(self, env, num_landmarks=8, seed=42):
+        self.num_landmarks = num_landmarks
+        self.seed = seed
+        self.build(env)
+
+    def build(self, env):
+        """Полное построение: выбор ориентиров и все Дейкстры."""
+        graph = env.graph
+        self.nodes = list(graph.nodes())
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        n = len(self.nodes)
+        self.landmarks = self.select_landmarks(graph)
+        self.dist = np.full((len(self.landmarks), len(METRICS), n), np.inf)
+        # Предшественники на кратчайших путях - нужны для инкрементального обновления
+        self.pred = [[None] * len(METRICS) for _ in self.landmarks]
+        for li in range(len(self.landmarks)):
+            for mi in range(len(METRICS)):
+                self._compute(graph, li, mi)
+        self.version = env.version
+        self.rebuilt = len(self.landmarks) * len(METRICS)
+
+    def select_landmarks(self, graph):
+        """Выбор ориентиров "по самой дальней точке" по задержке."""
+        rng = np.random.default_rng(self.seed)
+        k = min(self.num_landmarks, len(self.nodes))
+        chosen = [self.nodes[int(rng.integers(len(self.nodes)))]]
+        min_dist = np.full(len(self.nodes), np.inf)
+        while len(chosen) < k:
+            lengths = nx.single_source_dijkstra_path_length(graph, chosen[-1], weight='delay')
+            d = np.array([lengths.get(node, np.inf) for node in self.nodes])
+            np.minimum(min_dist, d, out=min_dist)
+            # Недостижимые узлы не выбираем, уже выбранные имеют расстояние 0
+            candidate = np.where(np.isfinite(min_dist), min_dist, -1.0)
+            chosen.append(self.nodes[int(np.argmax(candidate))])
+        return chosen
+
+    def _compute(self, graph, li, mi):
+        pred, lengths = nx.dijkstra_predecessor_and_distance(graph, self.landmarks[li], weight=METRICS[mi])
+        row = self.dist[li, mi]
+        row[:] = np.inf
+        for node, d in lengths.items():
+            row[self.index[node]] = d
+        self.pred[li][mi] = pred
+
+    def refresh(self, env):
+        """
+        Инкрементальное обновление после env.update_link().
+        Пересчитываются только пары (ориентир, метрика), для которых измененный канал
+        лежит в дереве кратчайших путей или после изменения дает более короткий путь.
+        Если журнал изменений не покрывает разницу версий - полная перестройка.
+        """
+        if env.version == self.version:
+            return
+        changes = env.changes_since(self.version)
+        if changes is None:
+            self.build(env)
+            return
+
+        graph = env.graph
+        stale = set()
+        for u, v in changes:
+            if u not in self.index or v not in self.index:
+                self.build(env)
+                return
+            iu, iv = self.index[u], self.index[v]
+            data = graph[u][v]
+            for li in range(len(self.landmarks)):
+                for mi, metric in enumerate(METRICS):
+                    if (li, mi) in stale:
+                        continue
+                    pred = self.pred[li][mi]
+                    d_u, d_v = self.dist[li, mi, iu], self.dist[li, mi, iv]
+                    w = data[metric]
+                    in_tree = u in pred.get(v, ()) or v in pred.get(u, ())
+                    if in_tree or d_u + w < d_v or d_v + w < d_u:
+                        stale.add((li, mi))
+
+        for li, mi in stale:
+            self._compute(graph, li, mi)
+        self.version = env.version
+        self.rebuilt = len(stale)
+
+    def metric_bounds(self, target):
+        """Нижние оценки остатка до target по каждой метрике: массив (3, n)."""
+        t = self.index[target]
+        diff = np.abs(self.dist[:, :, t][:, :, None] - self.dist)
+        # Недостижимость (inf - inf) не дает информации - оценка 0
+        diff = np.nan_to_num(diff, nan=0.0, posinf=0.0)
+        return diff.max(axis=0)
+
+    def heuristic(self, target, w_delay, w_rel, w_res):
+        """
+        Оптимистичная оценка взвешенной стоимости до target для всех узлов.
+        Возвращает словарь node -> оценка (для astar_path и Q-learning).
+        """
+        bounds = np.array([w_delay, w_rel, w_res]) @ self.metric_bounds(target)
+        return dict(zip(self.nodes, bounds.tolist()))
@@ -0,0 +1,116 @@
+import os
+import numpy as np
+
+# Папка для сохраненных раскладок графа
+LAYOUT_CACHE_DIR = ".layout_cache"
+
+# До этого размера используем Kamada-Kawai (O(n^2) по памяти - полная матрица расстояний),
+# дальше - масштабируемую силовую раскладку на массивах
+KAMADA_KAWAI_MAX_NODES = 500
+
+
+def layout_cache_path(env, method, cache_dir=LAYOUT_CACHE_DIR):
+    """Имя файла раскладки: ключ топологии (размер, вероятность связи, seed или имя файла)."""
+    name = (f"layout_{env.topology_key()}_"
+            f"e{env.graph.number_of_edges()}_{method}.npz")
+    return os.path.join(cache_dir, name)
+
+
+def sparse_force_layout(nodes, edges, iterations=100, repulsion_samples=32, seed=42):
+    """
+    Силовая раскладка Фрюхтермана-Рейнгольда на массивах NumPy.
+    Притяжение считается только по ребрам, отталкивание - по случайной выборке
+    repulsion_samples узлов на каждой итерации, поэтому время O(E + n*k),
+    а память O(n + E) вместо полной матрицы n x n.
+    """
+    n = len(nodes)
+    rng = np.random.default_rng(seed)
+    pos = rng.uniform(-1.0, 1.0, size=(n, 2))
+    if n < 2:
+        return pos
+
+    index = {node: i for i, node in enumerate(nodes)}
+    edge_idx = np.array([(index[u], index[v]) for u, v in edges], dtype=np.int64).reshape(-1, 2)
+    src, dst = edge_idx[:, 0], edge_idx[:, 1]
+
+    k = 1.0 / np.sqrt(n)          # Оптимальное расстояние между узлами
+    samples = min(repulsion_samples, n - 1)
+    scale = (n - 1) / samples     # Выборка представляет все остальные узлы
+    temperature = 0.1
+
+    for _ in range(iterations):
+        disp = np.zeros((n, 2))
+
+        # Отталкивание: k^2 / d от случайных узлов
+        others = rng.integers(0, n, size=(n, samples))
+        delta = pos[:, None, :] - pos[others]
+        dist2 = np.maximum((delta ** 2).sum(axis=2), 1e-9)
+        disp += scale * (delta * (k * k / dist2)[:, :, None]).sum(axis=1)
+
+        # Притяжение по ребрам: d^2 / k
+        delta = pos[src] - pos[dst]
+        dist = np.maximum(np.sqrt((delta ** 2).sum(axis=1)), 1e-9)
+        force = delta * (dist / k)[:, None]
+        np.add.at(disp, src, -force)
+        np.add.at(disp, dst, force)
+
+        # Ограничиваем смещение "температурой" и охлаждаем
+        length = np.maximum(np.sqrt((disp ** 2).sum(axis=1)), 1e-9)
+        pos += disp * (np.minimum(length, temperature) / length)[:, None]
+        temperature *= 0.97
+
+    # Нормируем в [-1, 1], как раскладки networkx
+    pos -= pos.mean(axis=0)
+    pos /= max(np.abs(pos).max(), 1e-9)
+    return pos
+
+
+def compute_layout(env, method="auto", seed=42):
+    """
+    Считает раскладку. Возвращает (layout, method): layout - словарь узел -> (x, y),
+    method - метод, которым раскладка реально построена (при ошибке Kamada-Kawai
+    это "sparse_force").
+    """
+    import networkx as nx
+
+    if method == "auto":
+        method = "kamada_kawai" if env.num_nodes <= KAMADA_KAWAI_MAX_NODES else "sparse_force"
+
+    if method == "kamada_kawai":
+        try:
+            # Kamada-Kawai выглядит аккуратнее на небольших графах
+            return nx.kamada_kawai_layout(env.graph), method
+        except Exception:
+            pass  # Например, нет scipy - используем силовую раскладку
+
+    nodes = list(env.graph.nodes())
+    pos = sparse_force_layout(nodes, env.graph.edges(), seed=seed)
+    return {node: pos[i] for i, node in enumerate(nodes)}, "sparse_force"
+
+
+def load_or_compute_layout(env, method="auto", cache_dir=LAYOUT_CACHE_DIR):
+    """
+    Загружает сохраненную раскладку для данной топологии или считает и сохраняет новую.
+    """
+    if method == "auto":
+        method = "kamada_kawai" if env.num_nodes <= KAMADA_KAWAI_MAX_NODES else "sparse_force"
+
+    # Если Kamada-Kawai однажды не сработал (например, нет scipy), раскладка сохранена
+    # как sparse_force - берем ее, а не пробуем Kamada-Kawai при каждом запуске
+    candidates = [method] + (["sparse_force"] if method == "kamada_kawai" else [])
+    for candidate in candidates:
+        path = layout_cache_path(env, candidate, cache_dir)
+        if os.path.isfile(path):
+            data = np.load(path)
+            nodes, pos = data["nodes"], data["pos"]
+            if len(nodes) == env.graph.number_of_nodes():
+                return {node.item(): pos[i] for i, node in enumerate(nodes)}
+
+    # Файл называем по методу, которым раскладка реально посчитана,
+    # чтобы запасная раскладка не выдавалась потом за Kamada-Kawai
+    layout, method = compute_layout(env, method)
+    path = layout_cache_path(env, method, cache_dir)
+    nodes = list(layout)
+    os.makedirs(cache_dir, exist_ok=True)
+    np.savez(path, nodes=np.array(nodes), pos=np.array([layout[node] for node in nodes], dtype=float))
+    return layout
@@ -0,0 +1,268 @@
+"""
+Точка входа командной строки.
+
+    python main.py route --source 0 --target 10 --algorithm GA
+    python main.py bench [main|layout|repair|pool|landmarks|threads|batch|memory|startup]
+    python main.py generate --nodes 250 --output net.csv
+    python main.py serve --port 8080
+    python main.py gui
+
+Тяжелые модули (networkx, matplotlib, tkinter, оптимизаторы) импортируются
+внутри подкоманд, поэтому короткий запрос маршрута не платит за графику.
+"""
+import argparse
+import contextlib
+import json
+import sys
+
+ALGORITHMS = ("GA", "QL", "ACO", "PARETO")
+BENCHMARKS = ("main", "layout", "repair", "pool", "landmarks", "threads", "batch", "memory", "startup")
+
+
+def add_network_args(parser):
+    """Общие параметры сети: сгенерированная (Erdős-Rényi) или загруженная из файла."""
+    parser.add_argument("--nodes", type=int, default=250, help="число узлов генерируемой сети")
+    parser.add_argument("--prob", type=float, default=0.4, help="вероятность связи")
+    parser.add_argument("--seed", type=int, default=42, help="seed генерации сети")
+    parser.add_argument("--topology", help="файл топологии (edge-list, CSV или GraphML)")
+    parser.add_argument("--nodes-file", help="CSV с метриками узлов для --topology")
+    parser.add_argument("--compact", action="store_true",
+                        help="хранить --topology в float32/int32 (вдвое меньше памяти)")
+
+
+def add_route_args(parser):
+    parser.add_argument("--algorithm", choices=ALGORITHMS, default="GA")
+    parser.add_argument("--weights", type=float, nargs=3, default=(0.33, 0.33, 0.34),
+                        metavar=("W_DELAY", "W_REL", "W_RES"))
+    parser.add_argument("--min-bandwidth", type=float, default=0.0)
+    parser.add_argument("--max-delay", type=float, default=float('inf'))
+    parser.add_argument("--min-reliability", type=float, default=0.0)
+
+
+def load_env(args):
+    from network_model import NetworkEnvironment
+
+    if args.topology:
+        from topology_loader import load_topology
+        return load_topology(args.topology, args.nodes_file, compact=args.compact)
+    return NetworkEnvironment(num_nodes=args.nodes, connection_prob=args.prob, seed=args.seed)
+
+
+def resolve_node(env, label):
+    """Внутренний номер узла по имени из командной строки."""
+    arrays = env._arrays
+    if arrays is None or arrays.node_labels is None:
+        node = int(label)
+        if not 0 <= node < env.num_nodes:
+            raise KeyError(label)
+        return node
+    if arrays.node_labels.dtype.kind in "iu":
+        label = int(label)
+    return arrays.node_index(label)
+
+
+def make_qos(min_bandwidth=0.0, max_delay=float('inf'), min_reliability=0.0):
+    """QoSConstraints или None, если ограничения не заданы."""
+    from network_model import QoSConstraints
+
+    if min_bandwidth <= 0 and max_delay == float('inf') and min_reliability <= 0:
+        return None
+    return QoSConstraints(min_bandwidth, max_delay, min_reliability)
+
+
+def route_result(env, path, cost):
+    """Результат маршрута в виде словаря для вывода/JSON."""
+    result = {"path": path, "cost": cost if path else None}
+    if path:
+        labels = env._arrays.node_labels if env._arrays is not None else None
+        if labels is not None:
+            result["path"] = [labels[i].item() for i in path]
+        delay, rel_cost, res_cost = env.calculate_path_metrics(path)
+        result.update(delay=delay, rel_cost=rel_cost, res_cost=res_cost)
+    return result
+
+
+def cmd_route(args):
+    from algorithms import solve
+
+    # С --json в stdout идет только JSON: сообщения о ходе работы - в stderr
+    progress = contextlib.redirect_stdout(sys.stderr) if args.json else contextlib.nullcontext()
+    with progress:
+        env = load_env(args)
+    params = {"qos": make_qos(args.min_bandwidth, args.max_delay, args.min_reliability)}
+    if args.algorithm != "PARETO" and args.solver_seed is not None:
+        params["seed"] = args.solver_seed
+    try:
+        source, target = resolve_node(env, args.source), resolve_node(env, args.target)
+    except (KeyError, ValueError) as e:
+        print(f"Неизвестный узел: {e}", file=sys.stderr)
+        return 2
+    with progress:
+        path, cost = solve(env, args.algorithm, source, target, *args.weights, **params)
+    result = route_result(env, path, cost)
+    if args.json:
+        print(json.dumps(result))
+    elif path:
+        print(f"Путь: {result['path']}")
+        print(f"Стоимость: {cost:.4f} (задержка {result['delay']:.2f} ms)")
+    else:
+        print("Путь не найден.")
+    return 0 if path else 1
+
+
+def cmd_bench(args):
+    import benchmark
+
+    suites = {
+        "main": benchmark.run_benchmark,
+        "layout": benchmark.run_layout_benchmark,
+        "repair": benchmark.run_repair_benchmark,
+        "pool": benchmark.run_pool_benchmark,
+        "landmarks": benchmark.run_landmark_benchmark,
+        "threads": benchmark.run_thread_stress_test,
+        "batch": benchmark.run_batch_benchmark,
+        "memory": benchmark.run_memory_benchmark,
+        "startup": benchmark.run_startup_benchmark,
+    }
+    # run_benchmark сам сохраняет CSV и строит графики
+    suites[args.suite]()
+    return 0
+
+
+def cmd_generate(args):
+    from network_model import NetworkEnvironment
+    from topology_loader import save_edge_list
+
+    env = NetworkEnvironment(num_nodes=args.nodes, connection_prob=args.prob, seed=args.seed)
+    nodes_path = args.nodes_output
+    if nodes_path is None and args.output.lower().endswith(".csv"):
+        nodes_path = args.output[:-4] + "_nodes.csv"
+    save_edge_list(env.arrays, args.output, nodes_path)
+    print(f"Сеть записана в {args.output}" + (f" (узлы: {nodes_path})" if nodes_path else ""))
+    return 0
+
+
+def make_route_handler(env, cache):
+    """
+    Обработчик HTTP-запросов сервера маршрутов:
+    GET /route?source=S&target=D[&algorithm=GA&w_delay=..&w_rel=..&w_res=..
+               &min_bandwidth=..&max_delay=..&min_reliability=..]
+    GET /stats - статистика кэша маршрутов.
+    """
+    from http.server import BaseHTTPRequestHandler
+    from urllib.parse import urlparse, parse_qs
+
+    class RouteHandler(BaseHTTPRequestHandler):
+        def send_json(self, status, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == "/stats":
+                self.send_json(200, cache.stats())
+                return
+            if url.path != "/route":
+                self.send_json(404, {"error": "unknown endpoint"})
+                return
+
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+            try:
+                algorithm = query.get("algorithm", "GA").upper()
+                if algorithm not in ALGORITHMS:
+                    raise ValueError(f"unknown algorithm: {algorithm}")
+                source = resolve_node(env, query["source"])
+                target = resolve_node(env, query["target"])
+                weights = [float(query.get(k, d)) for k, d in
+                           (("w_delay", 0.33), ("w_rel", 0.33), ("w_res", 0.34))]
+                qos = make_qos(float(query.get("min_bandwidth", 0.0)),
+                               float(query.get("max_delay", "inf")),
+                               float(query.get("min_reliability", 0.0)))
+            except (KeyError, ValueError, IndexError) as e:
+                self.send_json(400, {"error": f"bad request: {e}"})
+                return
+
+            path, cost = cache.solve(env, algorithm, source, target, *weights, qos=qos)
+            self.send_json(200, route_result(env, path, cost))
+
+        def log_message(self, format, *args):
+            pass  # Без построчного журнала запросов в stderr
+
+    return RouteHandler
+
+
+def cmd_serve(args):
+    from http.server import ThreadingHTTPServer
+    from route_cache import RouteCache
+
+    env = load_env(args)
+    cache = RouteCache()
+    # Каждый запрос - в своем потоке: оптимизаторы не меняют env (см. solve_concurrent)
+    server = ThreadingHTTPServer((args.host, args.port), make_route_handler(env, cache))
+    print(f"Сервер маршрутов: http://{args.host}:{server.server_port}/route?source=S&target=D")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def cmd_gui(args):
+    import tkinter as tk
+    from visualizer import NetworkVisualizerApp
+
+    root = tk.Tk()
+    NetworkVisualizerApp(root)
+    root.mainloop()
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="QoS-маршрутизация: GA, Q-Learning, муравьиный алгоритм, Парето-фронт.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("route", help="найти один маршрут S -> D")
+    add_network_args(p)
+    add_route_args(p)
+    p.add_argument("--source", required=True)
+    p.add_argument("--target", required=True)
+    p.add_argument("--solver-seed", type=int, help="seed оптимизатора (воспроизводимый результат)")
+    p.add_argument("--json", action="store_true", help="вывод в формате JSON")
+    p.set_defaults(func=cmd_route)
+
+    p = sub.add_parser("bench", help="запустить бенчмарк")
+    p.add_argument("suite", nargs="?", choices=BENCHMARKS, default="main")
+    p.set_defaults(func=cmd_bench)
+
+    p = sub.add_parser("generate", help="сгенерировать сеть и сохранить в CSV")
+    p.add_argument("--nodes", type=int, default=250)
+    p.add_argument("--prob", type=float, default=0.4)
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--output", required=True, help="CSV ребер")
+    p.add_argument("--nodes-output", help="CSV метрик узлов (по умолчанию <output>_nodes.csv)")
+    p.set_defaults(func=cmd_generate)
+
+    p = sub.add_parser("serve", help="HTTP-сервер маршрутов (JSON)")
+    add_network_args(p)
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8080)
+    p.set_defaults(func=cmd_serve)
+
+    p = sub.add_parser("gui", help="графический интерфейс")
+    p.set_defaults(func=cmd_gui)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
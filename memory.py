@@ -0,0 +1,112 @@
+import sys
+import types
+import numpy as np
+
+# Объекты, которые не считаем и внутрь которых не заходим: код, модули, генераторы
+_OPAQUE = (type, types.ModuleType, types.FunctionType, types.MethodType,
+           types.BuiltinFunctionType, types.GeneratorType)
+
+
+def deep_sizeof(obj, seen=None):
+    """
+    Размер объекта в байтах вместе со всем, на что он ссылается:
+    контейнеры, массивы NumPy (включая данные) и атрибуты обычных объектов.
+    Объекты, уже учтенные в seen, повторно не считаются - так общий
+    для нескольких категорий объект попадает только в первую.
+    """
+    if seen is None:
+        seen = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+        seen.add(id(o))
+        if isinstance(o, _OPAQUE):
+            continue
+        total += sys.getsizeof(o)
+
+        if isinstance(o, np.ndarray):
+            # getsizeof уже включает данные массива; для представления считаем его основу
+            if o.base is not None:
+                stack.append(o.base)
+        elif isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        elif hasattr(o, '__dict__'):
+            stack.append(vars(o))
+    return total
+
+
+def _default_caches():
+    """Общие кэши модулей, которые уже загружены (сами модули не импортируем)."""
+    caches = []
+    if 'algorithms.pareto' in sys.modules:
+        caches.append(sys.modules['algorithms.pareto'].default_store)
+    if 'algorithms.candidate_pool' in sys.modules:
+        caches.append(sys.modules['algorithms.candidate_pool'].default_pool_cache)
+    return caches
+
+
+def memory_report(env, optimizers=(), caches=None):
+    """
+    Разбивка памяти (байты) по категориям:
+    topology    - структура смежности (networkx и/или CSR-индексы NetworkArrays),
+    metrics     - метрики узлов и каналов (словари атрибутов или массивы), остатки полосы,
+    q_tables    - Q-таблицы QLearningOptimizer,
+    populations - популяции и история GeneticOptimizer,
+    caches      - кэши среды (графы по полосе, ориентиры, массивы) и переданные кэши
+                  (RouteCache, ParetoFrontStore, CandidatePoolCache; по умолчанию - общие).
+    Каждый объект учитывается один раз, в первой подходящей категории.
+    """
+    seen = {id(env), id(vars(env))}
+    report = {"topology": 0, "metrics": 0, "q_tables": 0, "populations": 0, "caches": 0}
+
+    graph = env._graph
+    if graph is not None:
+        # Сначала словари атрибутов (метрики), затем остальная структура графа
+        for _, data in graph.nodes(data=True):
+            report["metrics"] += deep_sizeof(data, seen)
+        for _, _, data in graph.edges(data=True):
+            report["metrics"] += deep_sizeof(data, seen)
+        report["topology"] += deep_sizeof(vars(graph), seen)
+
+    # Массивы без графа - основное представление сети; рядом с графом networkx
+    # они лишь его копия (env.arrays), поэтому относятся к caches
+    arrays = env._arrays
+    if arrays is not None:
+        structure = ('edge_u', 'edge_v', 'indptr', 'indices', 'arc_edge', 'node_labels',
+                     '_arc_ids', '_arc_source', '_padded_arcs', '_label_index')
+        for name, value in vars(arrays).items():
+            if graph is not None:
+                key = "caches"
+            else:
+                key = "topology" if name in structure else "metrics"
+            report[key] += deep_sizeof(value, seen)
+    report["metrics"] += deep_sizeof(env._residual, seen)
+
+    for opt in optimizers:
+        if hasattr(opt, 'q_table'):
+            report["q_tables"] += deep_sizeof(opt.q_table, seen)
+        if hasattr(opt, 'population'):
+            report["populations"] += deep_sizeof(opt.population, seen)
+            report["populations"] += deep_sizeof(opt.history, seen)
+
+    report["caches"] += deep_sizeof(env._bandwidth_views, seen)
+    report["caches"] += deep_sizeof(env._landmark_index, seen)
+    for cache in (_default_caches() if caches is None else caches):
+        report["caches"] += deep_sizeof(cache, seen)
+
+    report["total"] = sum(report.values())
+    return report
+
+
+def format_memory_report(report):
+    """Текстовая таблица отчета memory_report() в мегабайтах."""
+    lines = []
+    for name, size in report.items():
+        lines.append(f"{name:<12} {size / 2**20:10.2f} MB")
+    return "\n".join(lines)
@@ -0,0 +1,279 @@
+import heapq
+import math
+import numpy as np
+
+
+class NetworkArrays:
+    """
+    Компактное представление сети в виде массивов NumPy.
+    Ребра (неориентированные) хранятся в порядке edge_u/edge_v, метрики - по массиву на метрику.
+    Смежность - в формате CSR: соседи узла u лежат в indices[indptr[u]:indptr[u+1]]
+    (отсортированы), arc_edge дает номер ребра для каждой дуги.
+    """
+
+    def __init__(self, num_nodes, edge_u, edge_v, bandwidth, delay, reliability,
+                 proc_delay, node_reliability, node_labels=None):
+        self.num_nodes = num_nodes
+        self.node_labels = node_labels  # Исходные имена узлов (None = 0..n-1)
+        # True - массивы построены из env.graph, и его узлы - это node_labels;
+        # иначе (загруженная топология) граф строится по номерам 0..n-1
+        self.built_from_graph = False
+
+        # Метрики узлов
+        self.proc_delay = proc_delay
+        self.node_reliability = node_reliability
+        self.node_rel_cost = -np.log(node_reliability)
+
+        # Метрики ребер
+        self.edge_u = edge_u
+        self.edge_v = edge_v
+        self.bandwidth = bandwidth
+        self.delay = delay
+        self.reliability = reliability
+        # Производные стоимости считаются сразу для всех ребер
+        self.rel_cost = -np.log(reliability)
+        self.res_cost = 1000.0 / bandwidth
+
+        self.build_csr()
+
+    @property
+    def num_edges(self):
+        return len(self.edge_u)
+
+    @property
+    def is_compact(self):
+        return self.delay.dtype == np.float32
+
+    def build_csr(self):
+        """
+        Строит CSR-смежность по списку ребер (каждое ребро дает две дуги).
+        Дуги сортируются по единому ключу src * n + dst, чтобы соседи были
+        упорядочены (для бинарного поиска), а временных массивов было минимум.
+        """
+        n = self.num_nodes
+        m = self.num_edges
+        key = np.empty(2 * m, dtype=np.int64)
+        # dtype=int64: в компактном режиме edge_u - int32, и u * n переполнил бы его
+        np.multiply(self.edge_u, n, out=key[:m], dtype=np.int64)
+        key[:m] += self.edge_v
+        np.multiply(self.edge_v, n, out=key[m:], dtype=np.int64)
+        key[m:] += self.edge_u
+
+        order = np.argsort(key)
+        key = key[order]
+        np.remainder(key, n, out=key)
+        # Индексы CSR хранятся в том же типе, что и edge_u (int32 в компактном режиме)
+        index_dtype = self.edge_u.dtype
+        self.indices = key.astype(index_dtype, copy=False)
+        # Дуги i и i + m принадлежат одному ребру i
+        np.remainder(order, max(m, 1), out=order)
+        self.arc_edge = order.astype(index_dtype, copy=False)
+
+        counts = np.bincount(self.edge_u, minlength=n) + np.bincount(self.edge_v, minlength=n)
+        self.indptr = np.zeros(n + 1, dtype=index_dtype)
+        np.cumsum(counts, out=self.indptr[1:])
+
+    def neighbors(self, u):
+        return self.indices[self.indptr[u]:self.indptr[u + 1]]
+
+    def edge_id(self, u, v):
+        """Номер ребра (u, v) или -1, если ребра нет."""
+        start, end = self.indptr[u], self.indptr[u + 1]
+        pos = start + np.searchsorted(self.indices[start:end], v)
+        if pos < end and self.indices[pos] == v:
+            return int(self.arc_edge[pos])
+        return -1
+
+    def path_metrics(self, path):
+        """То же, что NetworkEnvironment.calculate_path_metrics, но по массивам."""
+        if not path or len(path) < 2:
+            return float('inf'), float('inf'), float('inf')
+        edges = [self.edge_id(u, v) for u, v in zip(path, path[1:])]
+        if min(edges) < 0:
+            raise KeyError("В пути есть несуществующее ребро")
+        edges = np.array(edges)
+        inner = np.asarray(path[1:-1], dtype=np.int64)
+        delay = self.delay[edges].sum() + self.proc_delay[inner].sum()
+        rel_cost = self.rel_cost[edges].sum() + self.node_rel_cost[inner].sum()
+        res_cost = self.res_cost[edges].sum()
+        return float(delay), float(rel_cost), float(res_cost)
+
+    def arc_weighted_cost(self, w_delay, w_rel, w_res):
+        """
+        Взвешенная стоимость каждой дуги CSR (как NetworkEnvironment.weighted_edge_cost):
+        метрики канала плюс метрики узла, в который ведет дуга.
+        """
+        edge_cost = w_delay * self.delay + w_rel * self.rel_cost + w_res * self.res_cost
+        node_cost = w_delay * self.proc_delay + w_rel * self.node_rel_cost
+        return edge_cost[self.arc_edge] + node_cost[self.indices]
+
+    def shortest_path_tree(self, arc_cost, source, target=None):
+        """
+        Дейкстра по CSR: релаксация всех соседей узла - одна векторная операция.
+        arc_cost - стоимость каждой дуги (inf - дуга недоступна).
+        Если задан target, поиск останавливается, как только он раскрыт.
+        Возвращает (dist, parent_arc): parent_arc[v] - дуга, по которой пришли в v (-1 - нет).
+        """
+        n = self.num_nodes
+        dist = np.full(n, np.inf)
+        parent_arc = np.full(n, -1, dtype=np.int64)
+        done = bytearray(n)
+        indptr, indices, arc_ids = self.indptr.tolist(), self.indices, self.arc_ids
+        dist[source] = 0.0
+        heap = [(0.0, source)]
+
+        while heap:
+            d, u = heapq.heappop(heap)
+            if done[u]:
+                continue
+            done[u] = 1
+            if u == target:
+                break
+            start, end = indptr[u], indptr[u + 1]
+            nbrs = indices[start:end]
+            new_dist = d + arc_cost[start:end]
+            better = new_dist < dist[nbrs]
+            if better.any():
+                nbrs = nbrs[better]
+                new_dist = new_dist[better]
+                dist[nbrs] = new_dist
+                parent_arc[nbrs] = arc_ids[start:end][better]
+                for v, dv in zip(nbrs.tolist(), new_dist.tolist()):
+                    heapq.heappush(heap, (dv, v))
+        return dist, parent_arc
+
+    def tree_path(self, parent_arc, source, target):
+        """
+        Путь source -> target по дереву кратчайших путей.
+        Возвращает (nodes, edges) или (None, None), если target недостижим.
+        """
+        if target != source and parent_arc[target] < 0:
+            return None, None
+        nodes = [target]
+        arcs = []
+        while nodes[-1] != source:
+            arc = int(parent_arc[nodes[-1]])
+            arcs.append(arc)
+            nodes.append(int(self.arc_source[arc]))
+        nodes.reverse()
+        arcs.reverse()
+        return nodes, self.arc_edge[arcs]
+
+    @property
+    def arc_ids(self):
+        """Номера дуг 0..2m-1 (для выборки номеров дуг по маске соседей)."""
+        if not hasattr(self, '_arc_ids'):
+            self._arc_ids = np.arange(len(self.indices), dtype=self.indices.dtype)
+        return self._arc_ids
+
+    @property
+    def arc_source(self):
+        """Начальный узел каждой дуги CSR (строится при первом обращении)."""
+        if not hasattr(self, '_arc_source'):
+            self._arc_source = np.repeat(np.arange(self.num_nodes, dtype=self.indices.dtype),
+                                         np.diff(self.indptr))
+        return self._arc_source
+
+    def padded_arcs(self):
+        """
+        Матрица (n, max_deg) номеров дуг: строка u - дуги узла u, дополненные -1.
+        Позволяет обрабатывать соседей многих узлов одной векторной операцией.
+        """
+        if not hasattr(self, '_padded_arcs'):
+            degree = np.diff(self.indptr)
+            width = int(degree.max()) if self.num_nodes else 0
+            padded = np.full((self.num_nodes, max(width, 1)), -1, dtype=self.indices.dtype)
+            column = self.arc_ids - self.indptr[self.arc_source]
+            padded[self.arc_source, column] = self.arc_ids
+            self._padded_arcs = padded
+        return self._padded_arcs
+
+    def node_index(self, label):
+        """Внутренний номер узла по его исходному имени."""
+        if self.node_labels is None:
+            return int(label)
+        if not hasattr(self, '_label_index'):
+            self._label_index = {lbl: i for i, lbl in enumerate(self.node_labels.tolist())}
+        return self._label_index[label]
+
+    def nbytes(self):
+        """Суммарный размер всех массивов в байтах."""
+        return sum(a.nbytes for a in vars(self).values() if isinstance(a, np.ndarray))
+
+    def to_compact(self):
+        """
+        Компактная копия: метрики float32, индексы int32 (если узлов и дуг меньше 2^31).
+        Занимает примерно вдвое меньше памяти; точность проверяет compare_precision().
+        """
+        index_dtype = np.int32 if max(self.num_nodes, 2 * self.num_edges) < 2**31 else np.int64
+        f32 = np.float32
+        return NetworkArrays(self.num_nodes, self.edge_u.astype(index_dtype), self.edge_v.astype(index_dtype),
+                             self.bandwidth.astype(f32), self.delay.astype(f32), self.reliability.astype(f32),
+                             self.proc_delay.astype(f32), self.node_reliability.astype(f32), self.node_labels)
+
+    def compare_precision(self, other, num_sources=20, weights=(0.33, 0.33, 0.34), seed=0):
+        """
+        Сравнение с другим представлением той же сети (обычно float64 против компактного):
+        относительные ошибки стоимостей деревьев кратчайших путей из случайных источников
+        и метрик найденных путей, а также доля узлов, чей путь совпал.
+        """
+        rng = np.random.default_rng(seed)
+        sources = rng.choice(self.num_nodes, size=min(num_sources, self.num_nodes), replace=False)
+        cost_ref, cost_other = self.arc_weighted_cost(*weights), other.arc_weighted_cost(*weights)
+        max_cost_err = max_metric_err = 0.0
+        same = total = 0
+        for s in sources.tolist():
+            dist_ref, parent_ref = self.shortest_path_tree(cost_ref, s)
+            dist_other, parent_other = other.shortest_path_tree(cost_other, s)
+            reached = np.isfinite(dist_ref) & (dist_ref > 0)
+            if reached.any():
+                err = np.abs(dist_other[reached] - dist_ref[reached]) / dist_ref[reached]
+                max_cost_err = max(max_cost_err, float(err.max()))
+            same += int((parent_ref == parent_other).sum())
+            total += self.num_nodes
+            # Метрики одного и того же пути в обоих представлениях
+            target = int(np.argmax(np.where(np.isfinite(dist_ref), dist_ref, -1.0)))
+            path, _ = self.tree_path(parent_ref, s, target)
+            if path is not None and len(path) > 1:
+                for a, b in zip(self.path_metrics(path), other.path_metrics(path)):
+                    if a > 0:
+                        max_metric_err = max(max_metric_err, abs(b - a) / a)
+        return {"max_cost_rel_err": max_cost_err, "max_metric_rel_err": max_metric_err,
+                "same_tree_ratio": same / total if total else 1.0}
+
+    @classmethod
+    def from_graph(cls, graph):
+        """Строит массивы из графа networkx с атрибутами NetworkEnvironment."""
+        nodes = list(graph.nodes())
+        index = {node: i for i, node in enumerate(nodes)}
+        labels = None if nodes == list(range(len(nodes))) else np.array(nodes)
+
+        edges = list(graph.edges(data=True))
+        edge_u = np.fromiter((index[u] for u, _, _ in edges), dtype=np.int64, count=len(edges))
+        edge_v = np.fromiter((index[v] for _, v, _ in edges), dtype=np.int64, count=len(edges))
+        bandwidth = np.fromiter((d['bandwidth'] for _, _, d in edges), dtype=float, count=len(edges))
+        delay = np.fromiter((d['delay'] for _, _, d in edges), dtype=float, count=len(edges))
+        reliability = np.fromiter((d['reliability'] for _, _, d in edges), dtype=float, count=len(edges))
+        proc_delay = np.array([graph.nodes[node]['proc_delay'] for node in nodes], dtype=float)
+        node_rel = np.array([graph.nodes[node]['reliability'] for node in nodes], dtype=float)
+
+        arrays = cls(len(nodes), edge_u, edge_v, bandwidth, delay, reliability,
+                     proc_delay, node_rel, labels)
+        arrays.built_from_graph = True
+        return arrays
+
+    def to_graph(self):
+        """Создает граф networkx с теми же атрибутами, что у NetworkEnvironment."""
+        import networkx as nx
+
+        graph = nx.Graph()
+        for i in range(self.num_nodes):
+            rel = float(self.node_reliability[i])
+            graph.add_node(i, proc_delay=float(self.proc_delay[i]), reliability=rel,
+                           rel_cost=-math.log(rel))
+        for e in range(self.num_edges):
+            graph.add_edge(int(self.edge_u[e]), int(self.edge_v[e]),
+                           bandwidth=float(self.bandwidth[e]), delay=float(self.delay[e]),
+                           reliability=float(self.reliability[e]),
+                           rel_cost=float(self.rel_cost[e]), res_cost=float(self.res_cost[e]))
+        return graph
@@ -1,27 +1,148 @@
-import networkx as nx
 import random
 import math
-import numpy as np
+import threading
+import itertools
+from collections import OrderedDict
+
+# networkx импортируется лениво внутри методов: среда на массивах
+# (загруженная топология, расчет метрик) обходится без него
+
+class QoSConstraints:
+    """
+    Ограничения качества обслуживания для маршрута:
+    минимальная пропускная способность каждого канала, максимальная задержка
+    и минимальная сквозная надежность пути.
+    """
+    def __init__(self, min_bandwidth=0.0, max_delay=float('inf'), min_reliability=0.0):
+        self.min_bandwidth = min_bandwidth
+        self.max_delay = max_delay
+        self.min_reliability = min_reliability
+        # Надежность пути = exp(-rel_cost), поэтому ограничение удобно хранить как предел rel_cost
+        self.max_rel_cost = -math.log(min_reliability) if min_reliability > 0 else float('inf')
+
+    def key(self):
+        """Хешируемый ключ для кэшей."""
+        return (self.min_bandwidth, self.max_delay, self.min_reliability)
+
+    def has_path_bounds(self):
+        return self.max_delay != float('inf') or self.max_rel_cost != float('inf')
+
+    def is_satisfied(self, delay, rel_cost):
+        """Проверяет ограничения по задержке и надежности (пропускная способность - через граф)."""
+        return delay <= self.max_delay and rel_cost <= self.max_rel_cost
+
+    def __repr__(self):
+        return (f"QoSConstraints(min_bandwidth={self.min_bandwidth}, "
+                f"max_delay={self.max_delay}, min_reliability={self.min_reliability})")
+
+
+# Общий счетчик версий для всех сред: версии разных сред (в т.ч. представлений
+# с отказами) никогда не совпадают, поэтому общие кэши их не перепутают
+_version_counter = itertools.count(1)
+
+
+def _next_version():
+    return next(_version_counter)
+
 
 class NetworkEnvironment:
+    # Сколько графов, отфильтрованных по полосе, хранить одновременно (LRU):
+    # каждый - полная копия графа, а порогов (например, из запросов сервера) может быть сколько угодно
+    max_bandwidth_views = 8
+
     def __init__(self, num_nodes=250, connection_prob=0.4, seed=42):
         self.num_nodes = num_nodes
         self.prob = connection_prob
         self.seed = seed
-        self.graph = None
+        self.name = None        # Имя файла для загруженных топологий
+        self._graph = None
+        self._arrays = None
+        self._arrays_version = None
+        # Версия сети: новое значение из общего счетчика при любом изменении
+        # топологии или метрик, чтобы кэши маршрутов не отдавали устаревшие результаты
+        self.version = 0
+        # Кэш отфильтрованных по пропускной способности графов: порог -> граф (LRU)
+        self._bandwidth_views = OrderedDict()
+        self._bandwidth_views_version = None
+        # Журнал изменений каналов (версия, u, v) для инкрементальных индексов;
+        # он полон для всех версий начиная с _log_start
+        self.change_log = []
+        self._log_start = 0
+        self._landmark_index = None
+        # Остаточная пропускная способность каналов для пакетной маршрутизации потоков
+        self._residual = None
+        self._residual_version = None
+        # Защищает ленивые кэши среды при параллельных запусках оптимизаторов
+        self._cache_lock = threading.RLock()
         
         # Генерация сети при инициализации
         self.generate_network()
 
+    @classmethod
+    def from_arrays(cls, arrays, name=None):
+        """
+        Создает среду из готовых массивов (например, загруженной топологии).
+        Граф networkx строится только при первом обращении к env.graph.
+        """
+        env = cls.__new__(cls)
+        env.num_nodes = arrays.num_nodes
+        env.prob = None
+        env.seed = None
+        env.name = name
+        env.version = _next_version()
+        env._graph = None
+        env._arrays = arrays
+        env._arrays_version = env.version
+        env._bandwidth_views = OrderedDict()
+        env._bandwidth_views_version = None
+        env.change_log = []
+        env._log_start = env.version
+        env._landmark_index = None
+        env._residual = None
+        env._residual_version = None
+        env._cache_lock = threading.RLock()
+        return env
+
+    @property
+    def graph(self):
+        if self._graph is None and self._arrays is not None:
+            with self._cache_lock:
+                if self._graph is None:
+                    self._graph = self._arrays.to_graph()
+        return self._graph
+
+    @graph.setter
+    def graph(self, value):
+        self._graph = value
+
+    @property
+    def arrays(self):
+        """Компактное (CSR) представление сети, пересобирается при смене версии."""
+        with self._cache_lock:
+            if self._arrays is None or self._arrays_version != self.version:
+                from network_arrays import NetworkArrays
+                self._arrays = NetworkArrays.from_graph(self.graph)
+                self._arrays_version = self.version
+            return self._arrays
+
+    def topology_key(self):
+        """Строка, однозначно описывающая топологию (для файловых кэшей)."""
+        if self.name is not None:
+            return f"{self.name}_n{self.num_nodes}_e{self.arrays.num_edges}"
+        return f"n{self.num_nodes}_p{self.prob}_s{self.seed}"
+
     def generate_network(self):
         """
         Создает граф согласно требованиям Раздела 2.1 PDF.
         """
+        import networkx as nx
+
         print(f"Генерация сети: {self.num_nodes} узлов, вероятность связи {self.prob}...")
         
-        # Используем seed для воспроизводимости (требование 7.2)
-        random.seed(self.seed)
-        np.random.seed(self.seed)
+        # Используем seed для воспроизводимости (требование 7.2).
+        # Локальный генератор дает ту же последовательность, что random.seed(seed),
+        # но не трогает глобальное состояние random
+        rng = random.Random(self.seed)
 
         # 1. Топология Erdős-Rényi (cite: 25)
         while True:
@@ -39,9 +160,9 @@ class NetworkEnvironment:
         # 3. Назначение свойств УЗЛАМ (cite: 27-30)
         for node in self.graph.nodes():
             # Задержка обработки: 0.5 - 2.0 ms
-            proc_delay = random.uniform(0.5, 2.0)
+            proc_delay = rng.uniform(0.5, 2.0)
             # Надежность узла: 0.95 - 0.999
-            reliability = random.uniform(0.95, 0.999)
+            reliability = rng.uniform(0.95, 0.999)
             
             self.graph.nodes[node]['proc_delay'] = proc_delay
             self.graph.nodes[node]['reliability'] = reliability
@@ -51,11 +172,11 @@ class NetworkEnvironment:
         # 4. Назначение свойств СВЯЗЯМ (cite: 31-35)
         for u, v in self.graph.edges():
             # Пропускная способность: 100 - 1000 Mbps
-            bw = random.uniform(100, 1000)
+            bw = rng.uniform(100, 1000)
             # Задержка канала: 3 - 15 ms
-            link_delay = random.uniform(3, 15)
+            link_delay = rng.uniform(3, 15)
             # Надежность канала: 0.95 - 0.999
-            link_rel = random.uniform(0.95, 0.999)
+            link_rel = rng.uniform(0.95, 0.999)
 
             self.graph[u][v]['bandwidth'] = bw
             self.graph[u][v]['delay'] = link_delay
@@ -67,8 +188,176 @@ class NetworkEnvironment:
             # 1 Gbps = 1000 Mbps
             self.graph[u][v]['res_cost'] = 1000.0 / bw
 
+        # Сеть создана заново: журнал изменений начинается с новой версии
+        self.version = _next_version()
+        self.change_log = []
+        self._log_start = self.version
         print("Сеть успешно создана.")
 
+    def update_link(self, u, v, **attrs):
+        """
+        Обновляет метрики канала (bandwidth, delay, reliability)
+        и пересчитывает производные стоимости. Увеличивает версию сети.
+        """
+        edge_data = self.graph[u][v]
+        edge_data.update(attrs)
+        if 'reliability' in attrs:
+            edge_data['rel_cost'] = -math.log(edge_data['reliability'])
+        if 'bandwidth' in attrs:
+            edge_data['res_cost'] = 1000.0 / edge_data['bandwidth']
+        self.version = _next_version()
+        self.change_log.append((self.version, u, v))
+
+    def changes_since(self, version):
+        """
+        Каналы, измененные после version, или None, если журнал не покрывает
+        все изменения (например, сеть была сгенерирована заново).
+        """
+        if version < self._log_start or version > self.version:
+            return None
+        return [(u, v) for ver, u, v in self.change_log if ver > version]
+
+    def get_landmark_index(self, num_landmarks=8):
+        """
+        Индекс ориентиров (ALT) для A* и оценок стоимости до цели.
+        Строится один раз и обновляется инкрементально при изменении каналов.
+        """
+        from landmarks import LandmarkIndex
+
+        with self._cache_lock:
+            index = self._landmark_index
+            if index is None or index.num_landmarks != num_landmarks:
+                index = LandmarkIndex(self, num_landmarks)
+                self._landmark_index = index
+            elif index.version != self.version:
+                index.refresh(self)
+            return index
+
+    def get_residual_bandwidth(self):
+        """
+        Остаточная пропускная способность каналов: массив в порядке ребер env.arrays.
+        Изначально равен bandwidth; потоки, размещенные BatchRouter, вычитают из него
+        свою полосу. При смене версии сети все резервирования сбрасываются.
+        """
+        with self._cache_lock:
+            arrays = self.arrays
+            if self._residual is None or self._residual_version != self.version:
+                self._residual = arrays.bandwidth.astype(float)
+                self._residual_version = self.version
+            return self._residual
+
+    def reset_residual_bandwidth(self):
+        """Снимает все резервирования полосы."""
+        with self._cache_lock:
+            self._residual = None
+
+    def get_bandwidth_view(self, min_bandwidth):
+        """
+        Граф без каналов с пропускной способностью ниже порога.
+        Строится один раз для каждого порога и переиспользуется между запросами
+        (сбрасывается при изменении версии сети). Хранятся только последние
+        max_bandwidth_views порогов.
+        """
+        if not min_bandwidth:
+            return self.graph
+
+        with self._cache_lock:
+            if self._bandwidth_views_version != self.version:
+                self._bandwidth_views = OrderedDict()
+                self._bandwidth_views_version = self.version
+
+            view = self._bandwidth_views.get(min_bandwidth)
+            if view is not None:
+                self._bandwidth_views.move_to_end(min_bandwidth)
+            else:
+                import networkx as nx
+                view = nx.Graph()
+                view.add_nodes_from(self.graph.nodes(data=True))
+                view.add_edges_from(
+                    (u, v, data) for u, v, data in self.graph.edges(data=True)
+                    if data['bandwidth'] >= min_bandwidth
+                )
+                self._bandwidth_views[min_bandwidth] = view
+                while len(self._bandwidth_views) > self.max_bandwidth_views:
+                    self._bandwidth_views.popitem(last=False)
+            return view
+
+    def failure_view(self, failed_links=(), failed_nodes=()):
+        """
+        Среда, в которой отказавшие каналы и узлы недоступны.
+        Исходная сеть не меняется; у представления своя версия (новое значение
+        общего счетчика), поэтому кэши не перепутают маршруты до и после отказа.
+        Набор отказов хранится отдельно: view.failed_nodes, view.failed_links.
+        Представление - обычная среда: его можно менять через update_link().
+        """
+        failed_nodes = frozenset(failed_nodes)
+        failed_links = frozenset(frozenset(link) for link in failed_links)
+        view = NetworkEnvironment.__new__(NetworkEnvironment)
+        view.__dict__.update(self.__dict__)
+        # Настоящая копия графа: ленивые фильтры networkx (restricted_view)
+        # слишком медленны при многократных обходах всех ребер в оптимизаторах
+        graph = self.graph.copy()
+        graph.remove_edges_from(tuple(link) for link in failed_links if len(link) == 2)
+        graph.remove_nodes_from(node for node in failed_nodes if node in graph)
+        view.graph = graph
+        view._arrays = None
+        view._bandwidth_views = OrderedDict()
+        view._bandwidth_views_version = None
+        view.change_log = []
+        view._landmark_index = None
+        view._residual = None
+        view._residual_version = None
+        view._cache_lock = threading.RLock()
+        view.version = _next_version()
+        view._log_start = view.version
+        view.failed_nodes = failed_nodes
+        view.failed_links = failed_links
+        return view
+
+    def weighted_edge_cost(self, w_delay, w_rel, w_res, graph=None):
+        """
+        Функция веса дуги u -> v для nx.dijkstra: метрики канала плюс метрики узла v.
+        Так сумма по пути отличается от calculate_weighted_cost только на стоимость
+        узла D, одинаковую для всех путей в D, поэтому порядок путей сохраняется.
+        """
+        nodes = (graph if graph is not None else self.graph).nodes
+
+        def cost(u, v, data):
+            node_data = nodes[v]
+            return (w_delay * (data['delay'] + node_data['proc_delay']) +
+                    w_rel * (data['rel_cost'] + node_data['rel_cost']) +
+                    w_res * data['res_cost'])
+        return cost
+
+    def qos_lower_bounds(self, graph, target):
+        """
+        Нижние оценки остатка пути до target по задержке и rel_cost
+        (без учета собственного узла). Используются для раннего отсечения
+        ветвей поиска, которые уже не могут уложиться в ограничения QoS.
+        """
+        def delay_weight(u, v, data):
+            # Путь идет v -> u -> ... -> target, u промежуточный, если не target
+            return data['delay'] + (graph.nodes[u]['proc_delay'] if u != target else 0.0)
+
+        def rel_weight(u, v, data):
+            return data['rel_cost'] + (graph.nodes[u]['rel_cost'] if u != target else 0.0)
+
+        import networkx as nx
+        delay_lb = nx.single_source_dijkstra_path_length(graph, target, weight=delay_weight)
+        rel_lb = nx.single_source_dijkstra_path_length(graph, target, weight=rel_weight)
+        return delay_lb, rel_lb
+
+    def satisfies_qos(self, path, qos):
+        """Проверяет путь на все ограничения QoS."""
+        if qos is None:
+            return True
+        if qos.min_bandwidth:
+            for u, v in zip(path, path[1:]):
+                if self.graph[u][v]['bandwidth'] < qos.min_bandwidth:
+                    return False
+        delay, rel_cost, _ = self.calculate_path_metrics(path)
+        return qos.is_satisfied(delay, rel_cost)
+
     def calculate_path_metrics(self, path):
         """
         Считает метрики для конкретного пути (список узлов).
@@ -77,6 +366,10 @@ class NetworkEnvironment:
         if not path or len(path) < 2:
             return float('inf'), float('inf'), float('inf')
 
+        # Загруженная топология без графа networkx - считаем по массивам
+        if self._graph is None and self._arrays is not None:
+            return self._arrays.path_metrics(path)
+
         total_delay = 0.0
         total_rel_cost = 0.0
         total_res_cost = 0.0
@@ -120,6 +413,8 @@ class NetworkEnvironment:
 
 # Простой тест (чтобы проверить, что работает)
 if __name__ == "__main__":
+    import networkx as nx
+
     env = NetworkEnvironment()
     # Берем случайные S и D
     nodes = list(env.graph.nodes())
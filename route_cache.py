@@ -0,0 +1,183 @@
+import threading
+import time
+from collections import OrderedDict
+
+from algorithms import solve
+
+
+class RouteCache:
+    """
+    Кэш результатов маршрутизации перед оптимизаторами.
+    Ключ: (S, D, квантованные веса, алгоритм, QoS, параметры оптимизатора, версия сети).
+    Вытеснение по размеру (LRU) и по времени жизни (TTL).
+    Результат "путь не найден" тоже кэшируется (негативный кэш).
+    Одновременные одинаковые промахи вычисляются только один раз (single-flight).
+    """
+
+    def __init__(self, max_size=1024, ttl=300.0, weight_precision=0.01, negative_ttl=None):
+        self.max_size = max_size
+        self.ttl = ttl                          # секунды, None = без ограничения
+        self.weight_precision = weight_precision
+        # Отрицательные результаты живут меньше (или столько же), чем обычные
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+
+        # key -> (path, cost, expires_at, compute_ms, params)
+        self._entries = OrderedDict()
+        # key -> threading.Event для вычислений "в полете"
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+        # Статистика
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.shared_waits = 0     # сколько запросов дождались чужого вычисления
+        self.saved_ms = 0.0       # суммарное сэкономленное время
+
+    def make_key(self, env, source, target, weights, algorithm, qos=None, params=None):
+        """
+        Квантует веса до weight_precision и собирает ключ кэша.
+        params - параметры оптимизатора (seed, pop_size, episodes, ...): разные
+        параметры дают разные результаты, поэтому входят в ключ (кроме qos - он уже там).
+        """
+        q = tuple(int(round(w / self.weight_precision)) for w in weights)
+        params_key = tuple(sorted((k, v) for k, v in (params or {}).items() if k != 'qos'))
+        return (source, target, q, algorithm, qos.key() if qos else None, params_key, env.version)
+
+    def _lookup(self, key, now):
+        """Возвращает запись или None. Вызывается под блокировкой."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[2] is not None and entry[2] < now:
+            del self._entries[key]
+            self.evictions += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key, path, cost, compute_ms, now, params=None):
+        """Сохраняет результат и вытесняет самые старые записи. Под блокировкой."""
+        ttl = self.ttl if path else self.negative_ttl
+        expires_at = now + ttl if ttl is not None else None
+        self._entries[key] = (path, cost, expires_at, compute_ms, params or {})
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_or_compute(self, env, source, target, weights, algorithm, compute, qos=None, params=None):
+        """
+        Возвращает (path, cost) из кэша или вызывает compute() -> (path, cost).
+        path=None означает "путь не найден" и тоже кэшируется.
+        params - параметры оптимизатора, с которыми compute() считает маршрут.
+        """
+        params = {k: v for k, v in (params or {}).items() if k != 'qos'}
+        key = self.make_key(env, source, target, weights, algorithm, qos, params)
+
+        while True:
+            with self._lock:
+                entry = self._lookup(key, time.monotonic())
+                if entry is not None:
+                    path, cost, _, compute_ms, _ = entry
+                    self.hits += 1
+                    if path is None:
+                        self.negative_hits += 1
+                    self.saved_ms += compute_ms
+                    break
+
+                event = self._inflight.get(key)
+                if event is None:
+                    # Мы первые: регистрируем вычисление
+                    event = threading.Event()
+                    self._inflight[key] = event
+                    self.misses += 1
+                    break
+                self.shared_waits += 1
+
+            # Кто-то уже считает этот же маршрут - ждем и перечитываем кэш
+            event.wait()
+
+        if entry is not None:
+            if path is None:
+                return None, float('inf')
+            # Запись могла быть посчитана для других весов с тем же квантованным ключом:
+            # путь переиспользуем, а стоимость считаем для весов этого запроса
+            return list(path), env.calculate_weighted_cost(path, *weights)
+
+        start = time.perf_counter()
+        try:
+            path, cost = compute()
+            if not path:
+                path, cost = None, float('inf')
+            compute_ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self._store(key, list(path) if path else None, cost, compute_ms, time.monotonic(), params)
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            event.set()
+
+        return (list(path) if path else None), cost
+
+    def solve(self, env, algorithm, source, target, w_delay, w_rel, w_res, **params):
+        """Кэширующая обертка над algorithms.solve()."""
+        return self.get_or_compute(
+            env, source, target, (w_delay, w_rel, w_res), algorithm,
+            lambda: solve(env, algorithm, source, target, w_delay, w_rel, w_res, **params),
+            qos=params.get('qos'), params=params)
+
+    def put(self, env, source, target, weights, algorithm, path, cost, qos=None, compute_ms=0.0, params=None):
+        """Кладет готовый результат в кэш (например, после ремонта маршрута)."""
+        params = {k: v for k, v in (params or {}).items() if k != 'qos'}
+        key = self.make_key(env, source, target, weights, algorithm, qos, params)
+        with self._lock:
+            self._store(key, list(path) if path else None, cost, compute_ms, time.monotonic(), params)
+
+    def items(self, version=None):
+        """
+        Снимок живых записей: список (source, target, weights, algorithm, qos_key, params, path, cost).
+        Веса восстанавливаются из квантованных значений. version фильтрует по версии сети.
+        """
+        now = time.monotonic()
+        with self._lock:
+            snapshot = list(self._entries.items())
+        result = []
+        for (source, target, q, algorithm, qos_key, _, key_version), (path, cost, expires_at, _, params) in snapshot:
+            if expires_at is not None and expires_at < now:
+                continue
+            if version is not None and key_version != version:
+                continue
+            weights = tuple(x * self.weight_precision for x in q)
+            result.append((source, target, weights, algorithm, qos_key, dict(params), path, cost))
+        return result
+
+    def invalidate(self, source=None, target=None):
+        """Удаляет записи (все или для заданных S и/или D)."""
+        with self._lock:
+            if source is None and target is None:
+                self._entries.clear()
+                return
+            for key in list(self._entries):
+                if (source is None or key[0] == source) and (target is None or key[1] == target):
+                    del self._entries[key]
+
+    def stats(self):
+        """Статистика кэша: hit rate и сэкономленное время."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "shared_waits": self.shared_waits,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "saved_ms": round(self.saved_ms, 2),
+            }
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
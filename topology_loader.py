@@ -0,0 +1,335 @@
+import csv
+import os
+import xml.etree.ElementTree as ET
+import numpy as np
+
+from network_arrays import NetworkArrays
+
+# Значения по умолчанию, если в файле нет метрики (середины диапазонов из Раздела 2.1)
+DEFAULT_LINK = {"delay": 9.0, "bandwidth": 550.0, "reliability": 0.9745}
+DEFAULT_NODE = {"proc_delay": 1.25, "reliability": 0.9745}
+
+# Синонимы имен колонок / атрибутов в реальных наборах данных
+COLUMN_ALIASES = {
+    "source": ("source", "src", "u", "from", "node1"),
+    "target": ("target", "dst", "v", "to", "node2"),
+    "delay": ("delay", "link_delay", "latency"),
+    "bandwidth": ("bandwidth", "bw", "capacity"),
+    "reliability": ("reliability", "link_rel", "rel"),
+    "proc_delay": ("proc_delay", "processing_delay"),
+}
+
+
+def _dtypes(compact, num_edges=0):
+    """
+    Типы (индексы, метрики) для загружаемых массивов: compact=True - int32/float32
+    (как NetworkArrays.to_compact), если число дуг помещается в int32.
+    """
+    if compact and 2 * num_edges < 2**31:
+        return np.int32, np.float32
+    if compact:
+        return np.int64, np.float32
+    return np.int64, np.float64
+
+
+class _NodeIndex:
+    """Отображение исходных имен узлов в номера 0..n-1."""
+
+    def __init__(self):
+        self.index = {}
+        self.labels = []
+
+    def get(self, label):
+        i = self.index.get(label)
+        if i is None:
+            i = len(self.labels)
+            self.index[label] = i
+            self.labels.append(label)
+        return i
+
+    def labels_array(self):
+        # Если имена - это 0..n-1, хранить их не нужно
+        try:
+            ints = [int(lbl) for lbl in self.labels]
+        except ValueError:
+            return np.array(self.labels)
+        if ints == list(range(len(ints))):
+            return None
+        return np.array(ints, dtype=np.int64)
+
+
+def _resolve_columns(header):
+    """Номера колонок для известных метрик по заголовку CSV."""
+    lowered = [h.strip().lower() for h in header]
+    columns = {}
+    for name, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in lowered:
+                columns[name] = lowered.index(alias)
+                break
+    return columns
+
+
+def _cell(row, col, default):
+    """Значение колонки col строки row; нет колонки или пустая ячейка -> default."""
+    if col is None or len(row) <= col or not row[col].strip():
+        return default
+    return float(row[col])
+
+
+def _data_lines(f):
+    """Строки файла без пустых и комментариев (#) - одно правило для подсчета и разбора."""
+    return (line for line in f if line.strip() and not line.startswith('#'))
+
+
+def _count_data_lines(path):
+    """Первый проход: число непустых строк без комментариев (для точного выделения памяти)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return sum(1 for _ in _data_lines(f))
+
+
+def _finalize(node_index, edge_u, edge_v, bandwidth, delay, reliability, node_attrs, compact=False):
+    """
+    Удаляет петли и дубликаты ребер, собирает NetworkArrays.
+    compact=True - метрики узлов тоже float32 (массивы ребер уже выделены в нужных типах).
+    """
+    n = len(node_index.labels)
+    float_dtype = _dtypes(compact)[1]
+
+    # Петли не нужны для маршрутизации; дубликаты (u, v) и (v, u) - оставляем первый.
+    # Ключ всегда int64: при индексах int32 произведение u * n переполнило бы их
+    key = np.minimum(edge_u, edge_v, dtype=np.int64)
+    key *= n
+    key += np.maximum(edge_u, edge_v)
+    _, keep = np.unique(key, return_index=True)
+    del key
+    keep = keep[edge_u[keep] != edge_v[keep]]
+    keep.sort()
+    m = len(keep)
+    if m != len(edge_u):
+        # Уплотняем массивы на месте, по одному - чтобы не держать вторую копию всех сразу
+        compacted = []
+        for arr in (edge_u, edge_v, bandwidth, delay, reliability):
+            arr[:m] = arr[keep]
+            compacted.append(arr[:m])
+        edge_u, edge_v, bandwidth, delay, reliability = compacted
+    del keep
+
+    proc_delay = np.full(n, DEFAULT_NODE["proc_delay"], dtype=float_dtype)
+    node_rel = np.full(n, DEFAULT_NODE["reliability"], dtype=float_dtype)
+    for i, (pd, rel) in node_attrs.items():
+        if pd is not None:
+            proc_delay[i] = pd
+        if rel is not None:
+            node_rel[i] = rel
+
+    return NetworkArrays(n, edge_u, edge_v, bandwidth, delay, reliability,
+                         proc_delay, node_rel, node_index.labels_array())
+
+
+def _load_node_table(path, node_index, node_attrs):
+    """CSV с метриками узлов: node, proc_delay, reliability."""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(_data_lines(f))
+        header = next(reader)
+        lowered = [h.strip().lower() for h in header]
+        node_col = lowered.index("node") if "node" in lowered else 0
+        cols = _resolve_columns(header)
+        for row in reader:
+            if not row:
+                continue
+            i = node_index.get(row[node_col].strip())
+            pd = _cell(row, cols.get("proc_delay"), None)
+            rel = _cell(row, cols.get("reliability"), None)
+            node_attrs[i] = (pd, rel)
+
+
+def load_edge_list(path, nodes_path=None, chunk_size=100_000, compact=False):
+    """
+    Потоково читает список ребер (CSV с заголовком или текст "u v [delay bw rel]")
+    прямо в массивы. Память выделяется один раз по числу строк, затем
+    заполняется порциями по chunk_size строк.
+    compact=True - массивы сразу выделяются как int32/float32, без копии float64.
+    """
+    is_csv = path.lower().endswith(".csv")
+    total = _count_data_lines(path) - (1 if is_csv else 0)
+    index_dtype, float_dtype = _dtypes(compact, total)
+
+    edge_u = np.empty(total, dtype=index_dtype)
+    edge_v = np.empty(total, dtype=index_dtype)
+    bandwidth = np.full(total, DEFAULT_LINK["bandwidth"], dtype=float_dtype)
+    delay = np.full(total, DEFAULT_LINK["delay"], dtype=float_dtype)
+    reliability = np.full(total, DEFAULT_LINK["reliability"], dtype=float_dtype)
+
+    node_index = _NodeIndex()
+    node_attrs = {}
+    if nodes_path:
+        _load_node_table(nodes_path, node_index, node_attrs)
+
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if is_csv:
+            reader = csv.reader(_data_lines(f))
+            cols = _resolve_columns(next(reader))
+            src_col, dst_col = cols.get("source", 0), cols.get("target", 1)
+        else:
+            # Текстовый формат: u v [delay bandwidth reliability]
+            reader = (line.split() for line in _data_lines(f))
+            cols = {"delay": 2, "bandwidth": 3, "reliability": 4}
+            src_col, dst_col = 0, 1
+
+        pos = 0
+        chunk = []
+        for row in reader:
+            if not row:
+                continue
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                pos = _fill_chunk(chunk, pos, src_col, dst_col, cols, node_index,
+                                  edge_u, edge_v, bandwidth, delay, reliability)
+                chunk = []
+        if chunk:
+            pos = _fill_chunk(chunk, pos, src_col, dst_col, cols, node_index,
+                              edge_u, edge_v, bandwidth, delay, reliability)
+
+    return _finalize(node_index, edge_u[:pos], edge_v[:pos], bandwidth[:pos],
+                     delay[:pos], reliability[:pos], node_attrs, compact)
+
+
+def _fill_chunk(chunk, pos, src_col, dst_col, cols, node_index,
+                edge_u, edge_v, bandwidth, delay, reliability):
+    """
+    Переносит порцию строк в предвыделенные массивы.
+    Метрики разбираются по каждой строке: строка без колонки или с пустой
+    ячейкой получает значение по умолчанию (строки могут быть разной длины).
+    """
+    end = pos + len(chunk)
+    edge_u[pos:end] = [node_index.get(row[src_col].strip()) for row in chunk]
+    edge_v[pos:end] = [node_index.get(row[dst_col].strip()) for row in chunk]
+    for name, target in (("bandwidth", bandwidth), ("delay", delay), ("reliability", reliability)):
+        col = cols.get(name)
+        if col is not None:
+            target[pos:end] = [_cell(row, col, DEFAULT_LINK[name]) for row in chunk]
+    return end
+
+
+def _data_elements(elem, ns):
+    """Дочерние <data> элемента - с пространством имен GraphML или без него."""
+    return (child for child in elem if child.tag.replace(ns, "") == "data")
+
+
+def load_graphml(path, compact=False):
+    """
+    Потоково читает GraphML через iterparse: каждый элемент очищается сразу
+    после разбора, поэтому XML-дерево целиком в памяти не хранится.
+    compact=True - массивы сразу int32/float32.
+    """
+    ns = "{http://graphml.graphdrawing.org/xmlns}"
+
+    # Первый проход: число ребер и описания ключей атрибутов
+    keys = {}
+    total = 0
+    graph_elem = None
+    for event, elem in ET.iterparse(path, events=("start", "end")):
+        tag = elem.tag.replace(ns, "")
+        if event == "start":
+            if tag == "graph":
+                graph_elem = elem
+            continue
+        if tag == "key":
+            keys[elem.get("id")] = elem.get("attr.name", elem.get("id")).lower()
+        elif tag == "edge":
+            total += 1
+        if tag in ("node", "edge"):
+            # Уже разобранные элементы удаляем из родителя, иначе дерево растет
+            graph_elem.clear()
+
+    def attr_name(key):
+        name = keys.get(key, key)
+        for canonical, aliases in COLUMN_ALIASES.items():
+            if name in aliases:
+                return canonical
+        return name
+
+    index_dtype, float_dtype = _dtypes(compact, total)
+    edge_u = np.empty(total, dtype=index_dtype)
+    edge_v = np.empty(total, dtype=index_dtype)
+    bandwidth = np.full(total, DEFAULT_LINK["bandwidth"], dtype=float_dtype)
+    delay = np.full(total, DEFAULT_LINK["delay"], dtype=float_dtype)
+    reliability = np.full(total, DEFAULT_LINK["reliability"], dtype=float_dtype)
+    edge_metrics = {"bandwidth": bandwidth, "delay": delay, "reliability": reliability}
+
+    node_index = _NodeIndex()
+    node_attrs = {}
+    pos = 0
+    for event, elem in ET.iterparse(path, events=("start", "end")):
+        tag = elem.tag.replace(ns, "")
+        if event == "start":
+            if tag == "graph":
+                graph_elem = elem
+            continue
+        if tag == "node":
+            i = node_index.get(elem.get("id"))
+            pd = rel = None
+            for data in _data_elements(elem, ns):
+                name = attr_name(data.get("key"))
+                if name == "proc_delay":
+                    pd = float(data.text)
+                elif name == "reliability":
+                    rel = float(data.text)
+            if pd is not None or rel is not None:
+                node_attrs[i] = (pd, rel)
+            graph_elem.clear()
+        elif tag == "edge":
+            edge_u[pos] = node_index.get(elem.get("source"))
+            edge_v[pos] = node_index.get(elem.get("target"))
+            for data in _data_elements(elem, ns):
+                target = edge_metrics.get(attr_name(data.get("key")))
+                if target is not None:
+                    target[pos] = float(data.text)
+            pos += 1
+            graph_elem.clear()
+
+    return _finalize(node_index, edge_u, edge_v, bandwidth, delay, reliability, node_attrs, compact)
+
+
+def save_edge_list(arrays, path, nodes_path=None):
+    """
+    Записывает сеть в CSV (source, target, delay, bandwidth, reliability),
+    который читает load_edge_list. Метрики узлов - в отдельный CSV nodes_path.
+    """
+    if arrays.node_labels is not None:
+        labels = arrays.node_labels.tolist()
+    else:
+        labels = list(range(arrays.num_nodes))
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["source", "target", "delay", "bandwidth", "reliability"])
+        for e in range(arrays.num_edges):
+            writer.writerow([labels[arrays.edge_u[e]], labels[arrays.edge_v[e]],
+                             repr(float(arrays.delay[e])), repr(float(arrays.bandwidth[e])),
+                             repr(float(arrays.reliability[e]))])
+    if nodes_path:
+        with open(nodes_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["node", "proc_delay", "reliability"])
+            for i in range(arrays.num_nodes):
+                writer.writerow([labels[i], repr(float(arrays.proc_delay[i])),
+                                 repr(float(arrays.node_reliability[i]))])
+
+
+def load_topology(path, nodes_path=None, chunk_size=100_000, compact=False):
+    """
+    Загружает реальную топологию (edge-list, CSV или GraphML) в NetworkEnvironment,
+    построенный на компактных массивах, без промежуточного графа networkx.
+    compact=True - метрики float32 и индексы int32 (как NetworkArrays.to_compact),
+    выделяемые сразу при чтении, поэтому пик памяти ниже, чем у полной загрузки.
+    """
+    from network_model import NetworkEnvironment
+
+    print(f"Загрузка топологии из {path}...")
+    if path.lower().endswith(".graphml"):
+        arrays = load_graphml(path, compact)
+    else:
+        arrays = load_edge_list(path, nodes_path, chunk_size, compact)
+    print(f"Загружено: {arrays.num_nodes} узлов, {arrays.num_edges} ребер.")
+    return NetworkEnvironment.from_arrays(arrays, name=os.path.basename(path))
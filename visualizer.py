@@ -3,16 +3,21 @@ from tkinter import ttk, messagebox
 import matplotlib.pyplot as plt
 # NavigationToolbar2Tk: Araç çubuğu (Zoom/Pan) için
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-import networkx as nx
+from matplotlib.collections import LineCollection
 import time
 import numpy as np
 import random
+import queue
+import threading
 
 # Modüllerimizi içe aktarıyoruz
 from network_model import NetworkEnvironment
 from algorithms.genetic import GeneticOptimizer
 from algorithms.q_learning import QLearningOptimizer
+from algorithms.ant_colony import AntColonyOptimizer
 from utils import save_results_to_csv, generate_report_name
+from route_cache import RouteCache
+from layout import load_or_compute_layout
 
 # --- RENK PALETİ (CYBERPUNK / DARK MODE) ---
 BG_COLOR = "#2b2b2b"        # Koyu gri arka plan
@@ -20,9 +25,14 @@ PANEL_COLOR = "#333333"     # Panel rengi
 TEXT_COLOR = "#ffffff"      # Beyaz metin
 ACCENT_COLOR = "#00d4ff"    # Vurgu rengi (Cyan) - Düğmeler ve düğümler için
 PATH_COLOR = "#ff3366"      # Yol rengi (Neon Kırmızı/Pembe)
+ACO_COLOR = "#ffcc00"       # Karınca kolonisi grafikleri (Neon Sarı)
 EDGE_COLOR = "#ffffff"      # Bağlantı rengi
 INPUT_BG = "#4d4d4d"        # Giriş kutusu arka planı
 
+# --- ARKA PLAN İŞÇİSİ AYARLARI ---
+POLL_INTERVAL_MS = 100      # Kuyruk kontrol aralığı
+REDRAW_INTERVAL_S = 0.5     # Ağ çizimi en fazla bu sıklıkta yenilenir
+
 class NetworkVisualizerApp:
     def __init__(self, root):
         self.root = root
@@ -34,11 +44,11 @@ class NetworkVisualizerApp:
 
         # 1. Ağın Başlatılması (Network Initialization)
         self.env = NetworkEnvironment()
-        try:
-            # Kamada-Kawai düzeni daha estetik görünür
-            self.pos = nx.kamada_kawai_layout(self.env.graph)
-        except:
-            self.pos = nx.spring_layout(self.env.graph, seed=42, k=0.15)
+        # Aynı (S, D, ağırlıklar) sorguları için rota önbelleği
+        self.route_cache = RouteCache(max_size=256, ttl=600.0)
+        # Düzen diskten yüklenir; yoksa hesaplanıp kaydedilir.
+        # Küçük ağlarda Kamada-Kawai, büyük ağlarda ölçeklenebilir kuvvet düzeni
+        self.pos = load_or_compute_layout(self.env)
 
         # --- GUI (Arayüz) ---
         # Sol Panel (Kontrol Paneli)
@@ -69,22 +79,31 @@ class NetworkVisualizerApp:
         self.create_label(control_frame, "Algoritma:")
         self.algo_combo = ttk.Combobox(control_frame, values=[
             "Genetik Algoritma (GA)", 
-            "Pekiştirmeli Öğrenme (Q-Learning)"
+            "Pekiştirmeli Öğrenme (Q-Learning)",
+            "Karınca Kolonisi (ACO)"
         ], state="readonly", font=("Segoe UI", 10))
         self.algo_combo.current(0)
         self.algo_combo.pack(fill='x', pady=5)
 
         # Hesaplama Butonu
-        tk.Button(control_frame, text="ROTA HESAPLA", command=self.calculate_path,
-                  bg=ACCENT_COLOR, fg="black", font=("Segoe UI", 10, "bold"), relief="flat", padx=10, pady=5).pack(fill='x', pady=15)
+        self.calc_button = tk.Button(control_frame, text="ROTA HESAPLA", command=self.calculate_path,
+                  bg=ACCENT_COLOR, fg="black", font=("Segoe UI", 10, "bold"), relief="flat", padx=10, pady=5)
+        self.calc_button.pack(fill='x', pady=15)
 
         self.create_separator(control_frame)
         
         # Benchmark Bölümü
         tk.Label(control_frame, text="KIYASLAMA (BENCHMARK)", font=("Segoe UI", 12, "bold"), bg=PANEL_COLOR, fg=PATH_COLOR).pack(pady=5)
         
-        tk.Button(control_frame, text="TESTİ BAŞLAT (20x5)", command=self.run_full_benchmark,
-                  bg=PATH_COLOR, fg="white", font=("Segoe UI", 10, "bold"), relief="flat", padx=10, pady=5).pack(fill='x', pady=5)
+        self.bench_button = tk.Button(control_frame, text="TESTİ BAŞLAT (20x5)", command=self.run_full_benchmark,
+                  bg=PATH_COLOR, fg="white", font=("Segoe UI", 10, "bold"), relief="flat", padx=10, pady=5)
+        self.bench_button.pack(fill='x', pady=5)
+
+        # İptal Butonu (yalnızca arka planda iş varken aktif)
+        self.cancel_button = tk.Button(control_frame, text="İPTAL", command=self.cancel_task,
+                  bg=INPUT_BG, fg="white", font=("Segoe UI", 10, "bold"), relief="flat", padx=10, pady=5,
+                  state=tk.DISABLED)
+        self.cancel_button.pack(fill='x', pady=5)
 
         # Log Alanı
         tk.Label(control_frame, text="Log (Kayıt):", bg=PANEL_COLOR, fg="gray", font=("Segoe UI", 9)).pack(anchor="w", pady=(10,0))
@@ -118,7 +137,16 @@ class NetworkVisualizerApp:
         # --- MOUSE TEKERLEĞİ İLE ZOOM ÖZELLİĞİ ---
         self.canvas.mpl_connect('scroll_event', self.zoom_with_scroll)
 
-        self.draw_network()
+        # --- ARKA PLAN İŞÇİSİ ---
+        # Ağır hesaplamalar ayrı bir thread'de çalışır; sonuçlar kuyruk üzerinden
+        # root.after ile ana thread'e aktarılır (Tk yalnızca ana thread'den çağrılır)
+        self.task_queue = queue.Queue()
+        self.worker = None
+        self.cancel_event = threading.Event()
+        self.pending_draw = None
+        self.last_draw_time = 0.0
+
+        self.build_static_scene()
 
     # --- Mouse Tekerleği ile Zoom Fonksiyonu ---
     def zoom_with_scroll(self, event):
@@ -185,49 +213,158 @@ class NetworkVisualizerApp:
     def create_separator(self, parent):
         tk.Frame(parent, height=1, bg="#555555").pack(fill='x', pady=10)
 
-    def draw_network(self, path=None, title_suffix=""):
+    def build_static_scene(self):
+        """
+        Statik topolojiyi (tüm bağlantılar ve düğümler) bir kez oluşturur.
+        Bağlantılar tek bir LineCollection olarak önceden hesaplanmış segment
+        dizisinden çizilir; yol katmanı ayrı, "animated" sanatçılardan oluşur.
+        """
+        nodes = list(self.env.graph.nodes())
+        self.node_index = {node: i for i, node in enumerate(nodes)}
+        self.pos_array = np.array([self.pos[node] for node in nodes], dtype=float)
+        edge_idx = np.array([(self.node_index[u], self.node_index[v]) for u, v in self.env.graph.edges()],
+                            dtype=np.int64).reshape(-1, 2)
+
         self.ax.clear()
-        
-        # Bağlantıları çiz (Şeffaf)
-        nx.draw_networkx_edges(
-            self.env.graph, self.pos, ax=self.ax, 
-            width=0.8, alpha=0.15, edge_color=EDGE_COLOR
-        )
-        
-        # Düğümleri çiz
-        nx.draw_networkx_nodes(
-            self.env.graph, self.pos, ax=self.ax, 
-            node_size=40, node_color=ACCENT_COLOR, 
-            linewidths=0
-        )
-        
-        # Yol bulunduysa vurgula (Neon Efekti)
-        if path:
-            path_edges = list(zip(path, path[1:]))
-            nx.draw_networkx_edges(
-                self.env.graph, self.pos, ax=self.ax, edgelist=path_edges, 
-                width=6.0, alpha=0.4, edge_color=PATH_COLOR
-            )
-            nx.draw_networkx_edges(
-                self.env.graph, self.pos, ax=self.ax, edgelist=path_edges, 
-                width=2.0, alpha=1.0, edge_color="white"
-            )
-            nx.draw_networkx_nodes(
-                self.env.graph, self.pos, ax=self.ax, nodelist=path, 
-                node_size=80, node_color="white"
-            )
-            labels = {path[0]: 'S', path[-1]: 'D'}
-            text_items = nx.draw_networkx_labels(
-                self.env.graph, self.pos, ax=self.ax, labels=labels, 
-                font_color='black', font_weight='bold', font_size=10
-            )
-            for _, t in text_items.items():
-                t.set_bbox(dict(facecolor=ACCENT_COLOR, alpha=0.8, edgecolor='none', pad=2))
-
-        self.ax.set_title(f"AĞ TOPOLOJİSİ {title_suffix}", color="white", fontsize=12, pad=10)
+        # Bağlantılar (Şeffaf) - (E, 2, 2) segment dizisi
+        self.ax.add_collection(LineCollection(self.pos_array[edge_idx], linewidths=0.8,
+                                              colors=EDGE_COLOR, alpha=0.15))
+        # Düğümler
+        self.ax.scatter(self.pos_array[:, 0], self.pos_array[:, 1], s=40, c=ACCENT_COLOR, linewidths=0)
+        self.ax.autoscale_view()
         self.ax.axis('off')
+
+        # Yol katmanı (Neon Efekti): yalnızca bunlar her sonuçta güncellenir
+        self.path_glow = LineCollection([], linewidths=6.0, colors=PATH_COLOR, alpha=0.4, animated=True)
+        self.path_core = LineCollection([], linewidths=2.0, colors="white", alpha=1.0, animated=True)
+        self.ax.add_collection(self.path_glow)
+        self.ax.add_collection(self.path_core)
+        self.path_nodes = self.ax.scatter([], [], s=80, c="white", animated=True)
+        label_box = dict(facecolor=ACCENT_COLOR, alpha=0.8, edgecolor='none', pad=2)
+        self.path_labels = [
+            self.ax.text(0, 0, text, color='black', fontweight='bold', fontsize=10,
+                         ha='center', va='center', bbox=label_box, animated=True, visible=False)
+            for text in ('S', 'D')
+        ]
+        self.title_artist = self.ax.set_title("AĞ TOPOLOJİSİ", color="white", fontsize=12, pad=10)
+        self.title_artist.set_animated(True)
+        self.overlay_artists = [self.path_glow, self.path_core, self.path_nodes,
+                                self.title_artist] + self.path_labels
+
+        self.background = None
+        # Tam çizimden sonra (zoom, pan, yeniden boyutlandırma) arka planı yakala
+        if getattr(self, 'draw_cid', None) is None:
+            self.draw_cid = self.canvas.mpl_connect('draw_event', self.on_canvas_draw)
         self.canvas.draw()
-        self.root.update()
+
+    def on_canvas_draw(self, event):
+        """Statik sahneyi önbelleğe alır ve yol katmanını üzerine çizer."""
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self.blit_overlay()
+
+    def blit_overlay(self):
+        """Önbellekteki arka planı geri yükler, yalnızca yol katmanını çizer."""
+        if self.background is None:
+            return
+        self.canvas.restore_region(self.background)
+        for artist in self.overlay_artists:
+            self.ax.draw_artist(artist)
+        self.canvas.blit(self.figure.bbox)
+
+    def draw_network(self, path=None, title_suffix=""):
+        """Yalnızca yol katmanını günceller: maliyet yol uzunluğuna bağlıdır."""
+        if path:
+            idx = np.array([self.node_index[node] for node in path], dtype=np.int64)
+            points = self.pos_array[idx]
+            segments = np.stack([points[:-1], points[1:]], axis=1)
+            self.path_glow.set_segments(segments)
+            self.path_core.set_segments(segments)
+            self.path_nodes.set_offsets(points)
+            for text, point in zip(self.path_labels, (points[0], points[-1])):
+                text.set_position(point)
+                text.set_visible(True)
+        else:
+            self.path_glow.set_segments([])
+            self.path_core.set_segments([])
+            self.path_nodes.set_offsets(np.empty((0, 2)))
+            for text in self.path_labels:
+                text.set_visible(False)
+
+        self.title_artist.set_text(f"AĞ TOPOLOJİSİ {title_suffix}")
+        self.blit_overlay()
+        self.last_draw_time = time.time()
+
+    # --- Arka Plan İşçisi ---
+    def start_task(self, target, *args):
+        """İşi worker thread'de başlatır ve kuyruğu dinlemeye başlar."""
+        if self.worker is not None and self.worker.is_alive():
+            messagebox.showinfo("Meşgul", "Devam eden bir işlem var")
+            return
+        self.cancel_event.clear()
+        self.calc_button.config(state=tk.DISABLED)
+        self.bench_button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+
+        def run():
+            try:
+                target(*args)
+            except Exception as e:
+                self.task_queue.put(("error", str(e)))
+            finally:
+                self.task_queue.put(("done", None))
+
+        self.worker = threading.Thread(target=run, daemon=True)
+        self.worker.start()
+        self.root.after(POLL_INTERVAL_MS, self.poll_queue)
+
+    def cancel_task(self):
+        self.cancel_event.set()
+        self.cancel_button.config(state=tk.DISABLED)
+        self.log("İptal ediliyor...")
+
+    def post(self, kind, payload=None):
+        """Worker thread'den ana thread'e mesaj gönderir."""
+        self.task_queue.put((kind, payload))
+
+    def poll_queue(self):
+        """
+        Kuyruktaki tüm mesajları tek seferde işler: log satırları toplu eklenir,
+        çizim istekleri birleştirilir ve REDRAW_INTERVAL_S ile sınırlanır.
+        """
+        lines = []
+        finished = False
+        while True:
+            try:
+                kind, payload = self.task_queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "log":
+                lines.append(payload)
+            elif kind == "draw":
+                self.pending_draw = payload  # Yalnızca en son çizim önemli
+            elif kind == "charts":
+                self.show_charts(*payload)
+            elif kind == "error":
+                lines.append(f"Hata: {payload}")
+            elif kind == "done":
+                finished = True
+
+        if lines:
+            self.result_text.insert(tk.END, "\n".join(lines) + "\n")
+            self.result_text.see(tk.END)
+
+        if self.pending_draw is not None and (finished or time.time() - self.last_draw_time >= REDRAW_INTERVAL_S):
+            path, title_suffix = self.pending_draw
+            self.pending_draw = None
+            self.draw_network(path, title_suffix)
+
+        if finished:
+            self.worker = None
+            self.calc_button.config(state=tk.NORMAL)
+            self.bench_button.config(state=tk.NORMAL)
+            self.cancel_button.config(state=tk.DISABLED)
+        else:
+            self.root.after(POLL_INTERVAL_MS, self.poll_queue)
 
     def calculate_path(self):
         try:
@@ -243,55 +380,71 @@ class NetworkVisualizerApp:
 
             selected_algo = self.algo_combo.get()
             self.log(f"{s} -> {d} rotası hesaplanıyor...", clear=True)
+            self.start_task(self.route_job, s, d, w_d, w_r, w_res, selected_algo)
 
-            start_time = time.time()
-            path = None
-            algo_name = ""
-            
-            if "Genetik" in selected_algo:
-                ga = GeneticOptimizer(self.env, s, d, w_d, w_r, w_res, pop_size=50, generations=50)
-                path, cost = ga.run()
-                algo_name = "GA"
-            elif "Q-Learning" in selected_algo:
-                ql = QLearningOptimizer(self.env, s, d, w_d, w_r, w_res, episodes=1500)
-                ql.train()
-                path, cost = ql.get_best_path()
-                algo_name = "QL"
+        except ValueError: messagebox.showerror("Hata", "Girişi kontrol edin")
 
-            duration = (time.time() - start_time) * 1000
-            
-            if not path:
-                self.log("Yol bulunamadı!")
-                return
+    def route_job(self, s, d, w_d, w_r, w_res, selected_algo):
+        """Worker thread: tek bir rota hesaplaması."""
+        start_time = time.time()
+        path = None
+        algo_name = ""
+        
+        if "Genetik" in selected_algo:
+            path, cost = self.route_cache.solve(self.env, "GA", s, d, w_d, w_r, w_res,
+                                                pop_size=50, generations=50)
+            algo_name = "GA"
+        elif "Q-Learning" in selected_algo:
+            path, cost = self.route_cache.solve(self.env, "QL", s, d, w_d, w_r, w_res,
+                                                episodes=1500)
+            algo_name = "QL"
+        elif "ACO" in selected_algo:
+            path, cost = self.route_cache.solve(self.env, "ACO", s, d, w_d, w_r, w_res,
+                                                num_ants=50, iterations=50)
+            algo_name = "ACO"
+
+        duration = (time.time() - start_time) * 1000
+        stats = self.route_cache.stats()
+
+        # Hesaplama bitmeden iptal edildiyse sonucu gösterme
+        if self.cancel_event.is_set():
+            self.post("log", "İptal edildi.")
+            return
+        
+        if not path:
+            self.post("log", "Yol bulunamadı!")
+            return
 
-            delay, rel_cost, res_cost = self.env.calculate_path_metrics(path)
-            total_cost = self.env.calculate_weighted_cost(path, w_d, w_r, w_res)
+        total_cost = self.env.calculate_weighted_cost(path, w_d, w_r, w_res)
 
-            self.log(f"Algoritma: {algo_name}")
-            self.log(f"Süre: {duration:.1f} ms")
-            self.log(f"Maliyet (Cost): {total_cost:.4f}")
-            self.log(f"Uzunluk: {len(path)} düğüm")
-            
-            self.draw_network(path)
-
-        except ValueError: messagebox.showerror("Hata", "Girişi kontrol edin")
+        self.post("log", f"Algoritma: {algo_name}")
+        self.post("log", f"Süre: {duration:.1f} ms")
+        self.post("log", f"Maliyet (Cost): {total_cost:.4f}")
+        self.post("log", f"Uzunluk: {len(path)} düğüm")
+        self.post("log", f"Önbellek: isabet {stats['hit_rate']*100:.0f}%, kazanç {stats['saved_ms']:.0f} ms")
+        self.post("draw", (path, ""))
 
     def run_full_benchmark(self):
         if not messagebox.askyesno("Kıyaslama", "Görsel test başlatılsın mı (20 senaryo)?"):
             return
 
         self.log("Kıyaslama başlıyor...", clear=True)
-        
+        self.start_task(self.benchmark_job)
+
+    def benchmark_job(self):
+        """Worker thread: 20x5 kıyaslama. İptal kontrolü her çalıştırmadan önce yapılır."""
         NUM_SCENARIOS = 20
         REPEATS = 5
         w_d, w_r, w_res = 0.33, 0.33, 0.34
         nodes = list(self.env.graph.nodes())
+        # Sabit tohumlu üreteç: her kıyaslamada aynı senaryolar
+        rng = random.Random(42)
 
         scenarios = []
         for _ in range(NUM_SCENARIOS):
-            s = random.choice(nodes)
-            d = random.choice(nodes)
-            while s == d: d = random.choice(nodes)
+            s = rng.choice(nodes)
+            d = rng.choice(nodes)
+            while s == d: d = rng.choice(nodes)
             scenarios.append((s, d))
 
         all_results_csv = []
@@ -299,17 +452,22 @@ class NetworkVisualizerApp:
         ga_total_costs = []
         ql_total_times = []
         ql_total_costs = []
+        aco_total_times = []
+        aco_total_costs = []
 
         start_total = time.time()
 
         for i, (s, d) in enumerate(scenarios):
-            self.log(f"Test {i+1}/{NUM_SCENARIOS}: {s}->{d}")
-            self.result_text.see(tk.END)
+            self.post("log", f"Test {i+1}/{NUM_SCENARIOS}: {s}->{d}")
 
             # GA (Genetik Algoritma)
             for r in range(REPEATS):
+                if self.cancel_event.is_set():
+                    self.post("log", "Kıyaslama iptal edildi.")
+                    return
                 st = time.time()
-                ga = GeneticOptimizer(self.env, s, d, w_d, w_r, w_res, pop_size=30, generations=30)
+                ga = GeneticOptimizer(self.env, s, d, w_d, w_r, w_res, pop_size=30, generations=30,
+                                      seed=i * REPEATS + r)
                 path, cost = ga.run()
                 dur = (time.time() - st) * 1000
                 ga_total_times.append(dur)
@@ -317,12 +475,15 @@ class NetworkVisualizerApp:
                 all_results_csv.append({"Test_ID": i+1, "Source": s, "Destination": d, "Algorithm": "Genetic Algorithm", "Run_ID": r+1, "Time_ms": dur, "Cost": cost, "Path_Length": len(path) if path else 0})
                 
                 if path and r == 0: 
-                    self.draw_network(path, title_suffix=f"| Test {i+1} | GA")
+                    self.post("draw", (path, f"| Test {i+1} | GA"))
 
             # QL (Q-Learning)
             for r in range(REPEATS):
+                if self.cancel_event.is_set():
+                    self.post("log", "Kıyaslama iptal edildi.")
+                    return
                 st = time.time()
-                ql = QLearningOptimizer(self.env, s, d, w_d, w_r, w_res, episodes=400)
+                ql = QLearningOptimizer(self.env, s, d, w_d, w_r, w_res, episodes=400, seed=i * REPEATS + r)
                 ql.train()
                 path, cost = ql.get_best_path()
                 dur = (time.time() - st) * 1000
@@ -331,17 +492,35 @@ class NetworkVisualizerApp:
                 all_results_csv.append({"Test_ID": i+1, "Source": s, "Destination": d, "Algorithm": "Q-Learning", "Run_ID": r+1, "Time_ms": dur, "Cost": cost if path else 0, "Path_Length": len(path) if path else 0})
                 
                 if path and r == 0:
-                    self.draw_network(path, title_suffix=f"| Test {i+1} | Q-Learning")
+                    self.post("draw", (path, f"| Test {i+1} | Q-Learning"))
+
+            # ACO (Karınca Kolonisi)
+            for r in range(REPEATS):
+                if self.cancel_event.is_set():
+                    self.post("log", "Kıyaslama iptal edildi.")
+                    return
+                st = time.time()
+                aco = AntColonyOptimizer(self.env, s, d, w_d, w_r, w_res, num_ants=30, iterations=30,
+                                         seed=i * REPEATS + r)
+                path, cost = aco.run()
+                dur = (time.time() - st) * 1000
+                if path: aco_total_costs.append(cost)
+                aco_total_times.append(dur)
+                all_results_csv.append({"Test_ID": i+1, "Source": s, "Destination": d, "Algorithm": "Ant Colony", "Run_ID": r+1, "Time_ms": dur, "Cost": cost if path else 0, "Path_Length": len(path) if path else 0})
+
+                if path and r == 0:
+                    self.post("draw", (path, f"| Test {i+1} | ACO"))
 
         total_time = time.time() - start_total
-        self.log(f"Tamamlandı! {total_time:.1f} sn.")
+        self.post("log", f"Tamamlandı! {total_time:.1f} sn.")
 
         filename = generate_report_name()
         save_results_to_csv(all_results_csv, filename)
         
-        self.show_charts(ga_total_times, ql_total_times, ga_total_costs, ql_total_costs)
+        self.post("charts", (ga_total_times, ql_total_times, aco_total_times,
+                             ga_total_costs, ql_total_costs, aco_total_costs))
 
-    def show_charts(self, ga_times, ql_times, ga_costs, ql_costs):
+    def show_charts(self, ga_times, ql_times, aco_times, ga_costs, ql_costs, aco_costs):
         top = tk.Toplevel(self.root)
         top.title("Sonuçlar")
         top.geometry("1000x500")
@@ -362,18 +541,20 @@ class NetworkVisualizerApp:
             ax.xaxis.label.set_color('white')
             ax.title.set_color('white')
 
-        labels = ['GA', 'Q-Learning']
-        avg_times = [np.mean(ga_times), np.mean(ql_times)]
+        labels = ['GA', 'Q-Learning', 'ACO']
+        colors = [ACCENT_COLOR, PATH_COLOR, ACO_COLOR]
+        avg_times = [np.mean(ga_times), np.mean(ql_times), np.mean(aco_times)]
         
-        bars1 = ax1.bar(labels, avg_times, color=[ACCENT_COLOR, PATH_COLOR])
+        bars1 = ax1.bar(labels, avg_times, color=colors)
         ax1.set_title('Ortalama Süre (ms)')
         ax1.bar_label(bars1, fmt='%.1f', color='white')
 
         avg_c_ga = np.mean(ga_costs) if ga_costs else 0
         avg_c_ql = np.mean(ql_costs) if ql_costs else 0
-        avg_costs = [avg_c_ga, avg_c_ql]
+        avg_c_aco = np.mean(aco_costs) if aco_costs else 0
+        avg_costs = [avg_c_ga, avg_c_ql, avg_c_aco]
         
-        bars2 = ax2.bar(labels, avg_costs, color=[ACCENT_COLOR, PATH_COLOR])
+        bars2 = ax2.bar(labels, avg_costs, color=colors)
         ax2.set_title('Ortalama Maliyet (Fitness)')
         ax2.bar_label(bars2, fmt='%.2f', color='white')
 
@@ -384,7 +565,7 @@ class NetworkVisualizerApp:
     def log(self, msg, clear=False):
         if clear: self.result_text.delete(1.0, tk.END)
         self.result_text.insert(tk.END, msg + "\n")
-        self.root.update()
+        self.result_text.see(tk.END)
 
 if __name__ == "__main__":
     root = tk.Tk()